@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+
+from typing import Any, Awaitable, Callable
+
+
+class AsyncRegistry:
+    """Event loop confined registry sharing one in-flight construction per key."""
+
+    def __init__(self) -> None:
+        self._dict = {}
+        self._constructions = {}
+
+    def __iter__(self):
+        return iter(list(self._dict))
+
+    def __len__(self):
+        return len(self._dict)
+
+    def __contains__(self, key):
+        return key in self._dict
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __getitem__(self, key):
+        return self.get(key)
+
+    def set(self, key, value):
+        self._dict[key] = value
+
+    def get(self, key, default=None):
+        return self._dict.get(key, default)
+
+    def setdefault(self, key, default=None):
+        return self._dict.setdefault(key, default)
+
+    def setdefault_with_func_construct(self, key, func=None):
+        if key not in self._dict:
+            self._dict[key] = func() if func is not None else None
+        return self._dict[key]
+
+    async def async_setdefault_with_func_construct(
+        self, key, func: Callable[[], Awaitable[Any]] | None = None
+    ):
+        if key in self._dict:
+            return self._dict[key]
+
+        construction = self._constructions.get(key)
+        if construction is not None:
+            return await asyncio.shield(construction)
+
+        construction = asyncio.get_running_loop().create_future()
+        self._constructions[key] = construction
+        try:
+            value = await func() if func is not None else None
+        except asyncio.CancelledError:
+            construction.cancel()
+            raise
+        except Exception as ex:
+            construction.set_exception(ex)
+            # Mark the exception as retrieved when nobody else was waiting
+            construction.exception()
+            raise
+        else:
+            self._dict[key] = value
+            construction.set_result(value)
+            return value
+        finally:
+            self._constructions.pop(key, None)
+
+    def pop(self, key, default=None):
+        return self._dict.pop(key, default)
+
+    def remove(self, key):
+        self._dict.pop(key, None)
+
+    def keys(self):
+        return list(self._dict.keys())
+
+    def values(self):
+        return list(self._dict.values())
+
+    def items(self):
+        return list(self._dict.items())
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .integration import HIDClimateControllerIntegration
+from .const import (
+    DOMAIN,
+    ENTITY_ID_KEY,
+    CONTROLLER_KEY,
+    DEVICE_DEFERRED_REGISTRATION_KEY,
+    SIGNAL_DEVICE_AVAILABILITY,
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    controller_config = entry.data.get(CONTROLLER_KEY, {})
+    controller_entity_id = controller_config.get(ENTITY_ID_KEY)
+    if not controller_entity_id:
+        return
+
+    if controller_config.get(DEVICE_DEFERRED_REGISTRATION_KEY, True):
+        return
+
+    async_add_entities([HIDClimateControllerConnectivitySensor(controller_entity_id)])
+
+
+class HIDClimateControllerConnectivitySensor(BinarySensorEntity):
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
+    _attr_should_poll = False
+
+    def __init__(self, controller_entity_id: str) -> None:
+        self._controller_entity_id = controller_entity_id
+        self._attr_unique_id = f"{controller_entity_id}_connectivity"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, controller_entity_id)}
+        )
+
+    @property
+    def is_on(self) -> bool:
+        liveness_tracker = (
+            HIDClimateControllerIntegration.get_instance().liveness_tracker
+        )
+        return (
+            liveness_tracker.is_available(self._controller_entity_id)
+            if liveness_tracker
+            else True
+        )
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_DEVICE_AVAILABILITY.format(unique_id=self._controller_entity_id),
+                self._async_availability_changed,
+            )
+        )
+
+    @callback
+    def _async_availability_changed(self, available: bool) -> None:
+        self.async_write_ha_state()
@@ -1,19 +1,57 @@
 from __future__ import annotations
 
 import logging
-import asyncio
+import time
 
 from typing import Any
 
-from homeassistant.core import HomeAssistant, Context, Event, State
-from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant, Event, callback
+from homeassistant.const import EVENT_STATE_CHANGED, STATE_UNAVAILABLE, STATE_UNKNOWN
 
-from .concurrent_dict import ConcurrentDict
+from .async_registry import AsyncRegistry
 from .climate_commands import ClimateCommands
 from .device_controller import DeviceController
-from .const import TRIGGERING_ENTITY_ULID_KEY, TRIGGERING_ENTITY_ID_KEY, ENTITY_ID_KEY
+from .state_delta import (
+    build_full_payload,
+    build_delta_payload,
+    build_confirm_payload,
+    project_state,
+    is_echo_of,
+)
+from .metrics import MetricsRegistry
+from .log_sampling import SampledLogger
+from .state_store import LastKnownStateStore
+from .const import (
+    TRIGGERING_ENTITY_ULID_KEY,
+    TRIGGERING_ENTITY_ID_KEY,
+    ENTITY_ID_KEY,
+    STATE_STORE_STATE_KEY,
+    STATE_STORE_SEQUENCE_KEY,
+    METRIC_STATE_EVENTS_HANDLED,
+    METRIC_FAN_OUT_TIME,
+    METRIC_ECHOES_CONFIRMED,
+    METRIC_ECHO_CORRECTIONS,
+    STATE_VALUE_KEY,
+    STATE_ATTRIBUTES_KEY,
+    STATE_SEQUENCE_KEY,
+    STATE_BASE_SEQUENCE_KEY,
+    ECHO_SUPPRESSION_WINDOW,
+)
 
 _LOGGER = logging.getLogger(__name__)
+_SAMPLED_LOGGER = SampledLogger(_LOGGER)
+
+_SERVICE_TURN_OFF = "turn_off"
+_HVAC_MODE_KEY = "hvac_mode"
+_HVAC_MODE_OFF = "off"
+
+
+class _Projection:
+    def __init__(self, fields: frozenset[str], state: dict[str, Any]) -> None:
+        self.fields = fields
+        self.previous_state = project_state(state, fields)
+        self.sequence = 0
+        self.controllers = {}
 
 
 class ClimateBridge:
@@ -21,10 +59,17 @@ class ClimateBridge:
     _config = None
     _entity_id = None
     _previous_event = None
+    _previous_state = None
+    _sequence = 0
     _climate_commands = None
     _climate_destroy_callback = None
     _controllers = None
-    _unsubscribe = None
+    _controller_ids_by_ulid = None
+    _full_state_controllers = None
+    _projections = None
+    _echo_expectations = None
+    _state_store = None
+    _restored = False
 
     def __init__(
         self,
@@ -32,6 +77,7 @@ class ClimateBridge:
         climate_commands: ClimateCommands,
         climate_destroy_callback: function,
         config: dict[str, Any],
+        state_store: LastKnownStateStore = None,
     ) -> None:
         self._hass = hass
         self._config = config
@@ -39,149 +85,316 @@ class ClimateBridge:
 
         self._climate_commands = climate_commands
         self._climate_destroy_callback = climate_destroy_callback
-        self._controllers = ConcurrentDict()
+        self._state_store = state_store
+        self._controllers = AsyncRegistry()
+        self._controller_ids_by_ulid = {}
+        self._full_state_controllers = {}
+        self._projections = {}
+        self._echo_expectations = {}
+        self._previous_state = {}
+
+        metrics = MetricsRegistry.get_instance()
+        self._state_events_handled = metrics.counter(
+            METRIC_STATE_EVENTS_HANDLED, self._entity_id
+        )
+        self._fan_out_time = metrics.histogram(METRIC_FAN_OUT_TIME, self._entity_id)
 
         state = self._climate_commands.get_state(self._entity_id)
         if state:
             self._previous_event = Event(
                 event_type=EVENT_STATE_CHANGED,
                 data={"entity_id": self._entity_id, "new_state": state},
-                context=Context,
+                context=state.context,
             )
+            self._previous_state = state.as_compressed_state()
 
-        self._unsubscribe = self._hass.bus.async_listen(
-            EVENT_STATE_CHANGED, self._async_handle_state_changed
-        )
+    async def async_restore(self) -> None:
+        if not self._state_store:
+            return
 
-    async def register_controller(self, config: dict[str, Any]) -> DeviceController:
-        entity_id = config.get(ENTITY_ID_KEY)
-        if not entity_id:
-            _LOGGER.debug(
-                "Missing entity_id in config. Skipping device controller registration"
-            )
+        stored = await self._state_store.async_get(self._entity_id)
+        if not stored:
             return
 
-        async def build_controller() -> DeviceController:
-            device_controller = DeviceController(self._hass, config)
-            await device_controller.initialize()
-            return device_controller
+        self._sequence = stored.get(STATE_STORE_SEQUENCE_KEY, 0)
+        if self._is_available(self._previous_event):
+            return
 
-        device_controller = (
-            await self._controllers.async_setdefault_with_func_construct(
-                entity_id, build_controller
-            )
+        _LOGGER.debug(
+            "Climate entity %s is not available yet. Seeding climate bridge with the last known state",
+            self._entity_id,
         )
+        self._previous_state = stored.get(STATE_STORE_STATE_KEY) or {}
+        self._restored = True
+
+    @property
+    def entity_id(self) -> str:
+        return self._entity_id
+
+    def get_controller(self, entity_id: str) -> DeviceController | None:
+        return self._controllers.get(entity_id)
+
+    @callback
+    def register_controller(self, device_controller: DeviceController) -> None:
+        entity_id = device_controller.entity_id
+        self._controllers.set(entity_id, device_controller)
+        self._controller_ids_by_ulid[device_controller.entity_id_ulid] = entity_id
+
+        fields = device_controller.fields
+        if fields:
+            projection = self._projections.get(fields)
+            if projection is None:
+                projection = self._projections[fields] = _Projection(
+                    fields, self._previous_state
+                )
+            projection.controllers[entity_id] = device_controller
+        else:
+            self._full_state_controllers[entity_id] = device_controller
+
         _LOGGER.debug("Registered device controller: %s", entity_id)
         _LOGGER.debug(
             "Climate entity %s is being controlled by %s",
             self._entity_id,
             self._controllers.keys(),
         )
-        if device_controller:
-            _LOGGER.debug(
-                "Triggering state changed event on %s device controller for initial data: %s",
-                entity_id,
-                self._previous_event,
-            )
-            state = self._get_mutated_state_from_event(self._previous_event)
-            await device_controller.state_changed(state)
-
-        return device_controller
-
-    async def unregister_controller(self, config: dict[str, Any]) -> None:
-        entity_id = config.get(ENTITY_ID_KEY)
-        if not entity_id:
-            _LOGGER.debug(
-                "Missing entity_id in config. Skipping device controller unregistration"
-            )
-            return
 
+    async def unregister_controller(self, entity_id: str) -> None:
         device_controller = self._controllers.pop(entity_id)
+        if device_controller:
+            self._controller_ids_by_ulid.pop(device_controller.entity_id_ulid, None)
+        self._full_state_controllers.pop(entity_id, None)
+        self._echo_expectations.pop(entity_id, None)
+        for fields, projection in list(self._projections.items()):
+            projection.controllers.pop(entity_id, None)
+            if not projection.controllers:
+                del self._projections[fields]
         _LOGGER.debug("Unregistered device controller: %s", entity_id)
         _LOGGER.debug(
             "Climate entity %s is being controlled by %s devices",
             self._entity_id,
             self._controllers.keys(),
         )
-        if device_controller:
-            _LOGGER.debug("Destroying device controller: %s", entity_id)
-            await device_controller.destroy()
 
         await self._request_removal_if_childless()
 
     async def destroy(self) -> None:
         _LOGGER.debug("Destroying climate bridge %s", self._entity_id)
 
-        _LOGGER.debug("Unsubscribing from state changed events")
-        if self._unsubscribe:
-            self._unsubscribe()
-
-        keys = self._controllers.keys()
-        if len(keys) == 0:
-            _LOGGER.debug("Unregistering all device controllers and destroying them")
-            for key in keys:
-                controller = self._controllers.pop(key)
-                if controller:
-                    await controller.destroy()
+        # Device controllers are owned by the integration and may drive other zones
+        for key in self._controllers.keys():
+            controller = self._controllers.pop(key)
+            if controller:
+                self._controller_ids_by_ulid.pop(controller.entity_id_ulid, None)
+        self._full_state_controllers.clear()
+        self._projections.clear()
+        self._echo_expectations.clear()
+
+    @callback
+    def expect_echo(
+        self, controller_entity_id: str, service: str, service_data: dict[str, Any]
+    ) -> None:
+        expected = self._get_echo_expectation(controller_entity_id) or {}
+        expected = {
+            **expected,
+            STATE_ATTRIBUTES_KEY: dict(expected.get(STATE_ATTRIBUTES_KEY, {})),
+        }
+
+        if service == _SERVICE_TURN_OFF:
+            expected[STATE_VALUE_KEY] = _HVAC_MODE_OFF
+        for key, value in service_data.items():
+            if value is None:
+                continue
+            if key == _HVAC_MODE_KEY:
+                expected[STATE_VALUE_KEY] = value
+            else:
+                expected[STATE_ATTRIBUTES_KEY][key] = value
+
+        self._echo_expectations[controller_entity_id] = (
+            expected,
+            self._hass.loop.time() + ECHO_SUPPRESSION_WINDOW,
+        )
 
-    def _should_handle(self, entity_id) -> Any:
-        return self._entity_id == entity_id
+    @callback
+    def forget_echo(self, controller_entity_id: str) -> None:
+        self._echo_expectations.pop(controller_entity_id, None)
 
-    async def _async_handle_state_changed(self, event: Event):
+    @callback
+    def async_handle_state_changed(self, event: Event) -> None:
+        started_at = time.perf_counter()
+        self._state_events_handled.increment()
         entity_id = event.data.get(ENTITY_ID_KEY)
-        if not self._should_handle(entity_id):
+
+        if self._restored:
+            if not self._is_available(event):
+                return
             _LOGGER.debug(
-                "Climate bridge %s should not handle state changed event from climate entity %s. Skipping event handling",
+                "Climate entity %s became available. Reconciling the last known state",
                 self._entity_id,
-                entity_id,
             )
-            return
+            self._restored = False
 
-        current_event = event
+        previous_state = self._previous_state
+        base_sequence = self._sequence
+        state = self._update_state_from_event(event)
 
-        state = self._get_mutated_state_from_event(current_event)
+        echo_controller_id = (
+            self._controller_ids_by_ulid.get(event.context.parent_id)
+            if event.context
+            else None
+        )
+        expected = (
+            self._get_echo_expectation(echo_controller_id)
+            if echo_controller_id
+            else None
+        )
 
-        _LOGGER.debug(
+        _SAMPLED_LOGGER.debug(
+            self._entity_id,
             "Climate bridge %s is handling state changed event from climate entity %s",
             self._entity_id,
             entity_id,
         )
 
-        async def local_handle_event(
-            controller: DeviceController, state: dict[str, Any]
-        ):
-            await controller.state_changed(state)
+        if self._full_state_controllers:
+            payload = self._build_payload(
+                previous_state, state, base_sequence, self._sequence, event
+            )
+            self._enqueue_state(
+                self._full_state_controllers, payload, echo_controller_id, expected
+            )
+
+        # One small payload per distinct field set, skipped when no watched field changed
+        for projection in self._projections.values():
+            projected = project_state(state, projection.fields)
+            if projected == projection.previous_state:
+                continue
+
+            payload = self._build_payload(
+                projection.previous_state,
+                projected,
+                projection.sequence,
+                projection.sequence + 1,
+                event,
+            )
+            projection.previous_state = projected
+            projection.sequence += 1
+            self._enqueue_state(
+                projection.controllers, payload, echo_controller_id, expected
+            )
+
+        self._fan_out_time.record(time.perf_counter() - started_at)
+
+    def _enqueue_state(
+        self,
+        controllers: dict[str, DeviceController],
+        payload: dict[str, Any],
+        echo_controller_id: str | None,
+        expected: dict[str, Any] | None,
+    ) -> None:
+        for entity_id, controller in controllers.items():
+            if expected is not None and entity_id == echo_controller_id:
+                controller.enqueue_state(
+                    self._get_echo_payload(entity_id, payload, expected),
+                    self._entity_id,
+                )
+            else:
+                controller.enqueue_state(payload, self._entity_id)
+
+    def _get_echo_payload(
+        self,
+        controller_entity_id: str,
+        payload: dict[str, Any],
+        expected: dict[str, Any],
+    ) -> dict[str, Any]:
+        metrics = MetricsRegistry.get_instance()
+        if is_echo_of(payload, expected):
+            metrics.counter(METRIC_ECHOES_CONFIRMED, controller_entity_id).increment()
+            return build_confirm_payload(
+                payload[STATE_BASE_SEQUENCE_KEY], payload[STATE_SEQUENCE_KEY], payload
+            )
 
-        tasks = [
-            local_handle_event(controller, state)
-            for controller in self._controllers.values()
-        ]
+        # The thermostat did not apply what was asked, the delta corrects the panel
+        self._echo_expectations.pop(controller_entity_id, None)
+        metrics.counter(METRIC_ECHO_CORRECTIONS, controller_entity_id).increment()
+        return payload
 
-        await asyncio.gather(*tasks)
+    def _get_echo_expectation(self, controller_entity_id: str) -> dict[str, Any] | None:
+        expectation = self._echo_expectations.get(controller_entity_id)
+        if expectation is None:
+            return None
 
-        self._previous_event = current_event
+        expected, expires_at = expectation
+        if self._hass.loop.time() > expires_at:
+            del self._echo_expectations[controller_entity_id]
+            return None
+        return expected
 
     async def _request_removal_if_childless(self) -> None:
         if self._climate_destroy_callback and len(self._controllers) == 0:
             await self._climate_destroy_callback(self._entity_id)
 
-    def _get_mutated_state_from_event(self, event: Event) -> dict[str, Any]:
-        triggering_entity_ulid = str(event.context.parent_id)
-
+    def _update_state_from_event(self, event: Event) -> dict[str, Any]:
         event_state = event.data.get("new_state")
         state = event_state.as_compressed_state() if event_state else {}
 
-        triggering_entity_ulid = state.get("context", {}).get("parent_id")
-        state[TRIGGERING_ENTITY_ULID_KEY] = triggering_entity_ulid
+        self._sequence += 1
+        self._previous_event = event
+        self._previous_state = state
 
-        triggering_entity_id = next(
-            (
-                key
-                for key, value in self._controllers.items()
-                if value.matches(triggering_entity_ulid)
-            ),
-            None,
-        )
-        state[TRIGGERING_ENTITY_ID_KEY] = triggering_entity_id
+        if self._state_store and self._is_available(event):
+            self._state_store.async_set(self._entity_id, state, self._sequence)
 
         return state
+
+    def _build_payload(
+        self,
+        previous_state: dict[str, Any],
+        state: dict[str, Any],
+        base_sequence: int,
+        sequence: int,
+        event: Event,
+    ) -> dict[str, Any]:
+        if previous_state and state:
+            payload = build_delta_payload(
+                previous_state, state, base_sequence, sequence
+            )
+        else:
+            payload = build_full_payload(state, sequence)
+
+        return self._add_triggering_data(payload, event)
+
+    def _is_available(self, event: Event | None) -> bool:
+        state = event.data.get("new_state") if event else None
+        return state is not None and state.state not in (
+            STATE_UNAVAILABLE,
+            STATE_UNKNOWN,
+        )
+
+    def get_full_state_payload(
+        self, device_controller: DeviceController | None = None
+    ) -> dict[str, Any]:
+        projection = (
+            self._projections.get(device_controller.fields)
+            if device_controller and device_controller.fields
+            else None
+        )
+        if projection:
+            payload = build_full_payload(projection.previous_state, projection.sequence)
+        else:
+            payload = build_full_payload(self._previous_state, self._sequence)
+        return self._add_triggering_data(payload, self._previous_event)
+
+    def _add_triggering_data(
+        self, payload: dict[str, Any], event: Event | None
+    ) -> dict[str, Any]:
+        triggering_entity_ulid = (
+            event.context.parent_id if event and event.context else None
+        )
+        triggering_entity_id = self._controller_ids_by_ulid.get(triggering_entity_ulid)
+
+        # Most changes are not caused by a controller, keep those payloads small
+        if triggering_entity_id:
+            payload[TRIGGERING_ENTITY_ULID_KEY] = triggering_entity_ulid
+            payload[TRIGGERING_ENTITY_ID_KEY] = triggering_entity_id
+
+        return payload
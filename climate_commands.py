@@ -72,10 +72,14 @@ class ClimateCommands:
             service=self._SERVICE_SET_TEMPERATURE,
             target_entity_id=target_entity_id,
             service_data={
-                "temperature": temperature,
-                "target_temp_high": target_temp_high,
-                "target_temp_low": target_temp_low,
-                "hvac_mode": hvac_mode,
+                key: value
+                for key, value in (
+                    ("temperature", temperature),
+                    ("target_temp_high", target_temp_high),
+                    ("target_temp_low", target_temp_low),
+                    ("hvac_mode", hvac_mode),
+                )
+                if value is not None
             },
             triggering_entity_id=triggering_entity_id,
         )
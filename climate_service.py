@@ -1,8 +1,12 @@
+import time
+
 from typing import Any
 
 from homeassistant.core import HomeAssistant, Context, State, ServiceResponse
 
 from .utilities import Utilities
+from .metrics import MetricsRegistry
+from .const import METRIC_SERVICE_CALL_LATENCY
 
 
 class ClimateService:
@@ -12,6 +16,7 @@ class ClimateService:
 
     def __init__(self, hass: HomeAssistant) -> None:
         self._hass = hass
+        self._metrics = MetricsRegistry.get_instance()
 
     def get_state(self, entity_id) -> State | None:
         return self._hass.states.get(entity_id)
@@ -23,12 +28,21 @@ class ClimateService:
         service_data: dict[str, Any],
         triggering_entity_id: str = None,
     ) -> ServiceResponse:
-        parent_id = Utilities.encode_string_as_ulid(triggering_entity_id)
-        context = Context(parent_id=parent_id)
-        return await self._hass.services.async_call(
-            domain=self._DOMAIN,
-            service=service,
-            target={"entity_id": target_entity_id},
-            service_data=service_data,
-            context=context,
+        context = (
+            Context(parent_id=Utilities.encode_string_as_ulid(triggering_entity_id))
+            if triggering_entity_id
+            else Context()
         )
+        started_at = time.perf_counter()
+        try:
+            return await self._hass.services.async_call(
+                domain=self._DOMAIN,
+                service=service,
+                target={"entity_id": target_entity_id},
+                service_data=service_data,
+                context=context,
+            )
+        finally:
+            self._metrics.histogram(METRIC_SERVICE_CALL_LATENCY, service).record(
+                time.perf_counter() - started_at
+            )
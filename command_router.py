@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import logging
+import functools
+
+from typing import Callable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.components import mqtt
+
+from .command_scheduler import ClimateCommandScheduler
+from .climate_bridge import ClimateBridge
+from .device_controller import DeviceController
+from .metrics import MetricsRegistry
+from .publish_scheduler import PublishScheduler
+from .const import (
+    COMMAND_TOPIC_FILTER,
+    COMMAND_ACK_TOPIC,
+    MESSAGE_ID_KEY,
+    ACK_SUCCESS_KEY,
+    ACK_ERROR_KEY,
+    COMMAND_ZONE_KEY,
+    PUBLISH_PRIORITY_ACK,
+    METRIC_COMMAND_ACK_LATENCY,
+    METRIC_COMMANDS_FAILED,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_UNIQUE_ID_TOPIC_LEVEL = 2
+_SERVICE_NAME_TOPIC_LEVEL = 4
+
+
+class MqttCommandRouter:
+    """Routes .../<unique_id>/services/<service_name> messages to the command scheduler."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        publish_scheduler: PublishScheduler,
+        command_scheduler: ClimateCommandScheduler,
+        device_controller_resolver: Callable[[str], DeviceController | None],
+        climate_bridges_resolver: Callable[[str], dict[str, ClimateBridge] | None],
+    ) -> None:
+        self._hass = hass
+        self._publish_scheduler = publish_scheduler
+        self._device_controller_resolver = device_controller_resolver
+        self._climate_bridges_resolver = climate_bridges_resolver
+        self._handlers = {
+            command: functools.partial(command_scheduler.submit, command)
+            for command in command_scheduler.get_commands()
+        }
+        self._metrics = MetricsRegistry.get_instance()
+        self._unsubscribe = None
+
+    async def start(self) -> None:
+        if self._unsubscribe:
+            return
+
+        _LOGGER.debug("Subscribing to command topic filter %s", COMMAND_TOPIC_FILTER)
+        self._unsubscribe = await mqtt.async_subscribe(
+            self._hass,
+            COMMAND_TOPIC_FILTER,
+            self._async_handle_command,
+            1,
+            encoding=None,
+        )
+
+    async def stop(self) -> None:
+        if self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    @callback
+    def _async_handle_command(self, msg) -> None:
+        topic_levels = msg.topic.split("/")
+        unique_id = topic_levels[_UNIQUE_ID_TOPIC_LEVEL]
+        service_name = topic_levels[_SERVICE_NAME_TOPIC_LEVEL]
+
+        device_controller = self._device_controller_resolver(unique_id)
+        climate_bridges = self._climate_bridges_resolver(unique_id)
+        if not device_controller or not climate_bridges:
+            _LOGGER.debug(
+                "Received %s command from unregistered device controller %s. Skipping command handling",
+                service_name,
+                unique_id,
+            )
+            return
+
+        self._hass.async_create_task(
+            self._async_execute_command(
+                climate_bridges,
+                device_controller,
+                service_name,
+                msg.payload,
+                self._hass.loop.time(),
+            )
+        )
+
+    async def _async_execute_command(
+        self,
+        climate_bridges: dict[str, ClimateBridge],
+        device_controller: DeviceController,
+        service_name: str,
+        payload: bytes,
+        received_at: float,
+    ) -> None:
+        unique_id = device_controller.entity_id
+        wire_format = device_controller.wire_format
+        message_id = None
+        climate_bridge = None
+
+        try:
+            data = wire_format.decode(payload) if payload else {}
+            if not isinstance(data, dict):
+                raise ValueError("Command payload must be a mapping")
+
+            message_id = data.pop(MESSAGE_ID_KEY, None)
+            climate_bridge = self._resolve_zone(
+                climate_bridges, data.pop(COMMAND_ZONE_KEY, None)
+            )
+
+            handler = self._handlers.get(service_name)
+            if not handler:
+                raise ValueError(f"Unknown service {service_name}")
+
+            if device_controller.echo_suppression:
+                climate_bridge.expect_echo(unique_id, service_name, data)
+
+            await handler(
+                target_entity_id=climate_bridge.entity_id,
+                triggering_entity_id=unique_id,
+                **data,
+            )
+            ack = {MESSAGE_ID_KEY: message_id, ACK_SUCCESS_KEY: True}
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.error(
+                "Failed to execute %s command from device controller %s: %s",
+                service_name,
+                unique_id,
+                ex,
+            )
+            ack = {
+                MESSAGE_ID_KEY: message_id,
+                ACK_SUCCESS_KEY: False,
+                ACK_ERROR_KEY: str(ex),
+            }
+            self._metrics.counter(METRIC_COMMANDS_FAILED, unique_id).increment()
+            if device_controller.echo_suppression and climate_bridge:
+                # The panel already shows the rejected value, resync it
+                climate_bridge.forget_echo(unique_id)
+                device_controller.enqueue_state(
+                    climate_bridge.get_full_state_payload(device_controller),
+                    climate_bridge.entity_id,
+                )
+
+        await self._publish_scheduler.async_publish(
+            COMMAND_ACK_TOPIC.format(unique_id=unique_id, service_name=service_name),
+            wire_format.encode(ack),
+            1,
+            priority=PUBLISH_PRIORITY_ACK,
+            device=unique_id,
+        )
+        self._metrics.histogram(METRIC_COMMAND_ACK_LATENCY, unique_id).record(
+            self._hass.loop.time() - received_at
+        )
+
+    def _resolve_zone(
+        self, climate_bridges: dict[str, ClimateBridge], zone: str | None
+    ) -> ClimateBridge:
+        if zone is None:
+            if len(climate_bridges) != 1:
+                raise ValueError(
+                    f"Command must address one of the zones {list(climate_bridges)}"
+                )
+            return next(iter(climate_bridges.values()))
+
+        climate_bridge = climate_bridges.get(zone)
+        if not climate_bridge:
+            raise ValueError(f"Unknown zone {zone}")
+        return climate_bridge
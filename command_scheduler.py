@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import logging
+import asyncio
+import inspect
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, ServiceResponse, callback
+
+from .climate_commands import ClimateCommands
+from .timer_wheel import TimerWheel
+from .const import COMMAND_MERGE_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+# Every command that decides the HVAC mode shares one kind, so the newest one wins
+_MODE_KIND = "mode"
+_COMMAND_KINDS = {
+    "turn_on": _MODE_KIND,
+    "turn_off": _MODE_KIND,
+    "set_hvac_mode": _MODE_KIND,
+}
+_SET_TEMPERATURE = "set_temperature"
+_SET_HVAC_MODE = "set_hvac_mode"
+_HVAC_MODE_KEY = "hvac_mode"
+
+
+class _PendingBatch:
+    def __init__(self) -> None:
+        self.commands = {}
+        self.futures = {}
+        self.flush_handle = None
+
+
+class ClimateCommandScheduler:
+    """Merges bursts of commands per target entity into as few service calls as possible."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        climate_commands: ClimateCommands,
+        merge_window: float = COMMAND_MERGE_WINDOW,
+    ) -> None:
+        self._hass = hass
+        self._climate_commands = climate_commands
+        self._merge_window = merge_window
+        self._handlers = {
+            command: getattr(climate_commands, command)
+            for command in climate_commands.get_commands()
+        }
+        self._signatures = {
+            command: inspect.signature(handler)
+            for command, handler in self._handlers.items()
+        }
+        self._batches = {}
+        self._timer_wheel = TimerWheel.get_instance()
+
+    def get_commands(self) -> list[str]:
+        return self._climate_commands.get_commands()
+
+    async def submit(
+        self,
+        service: str,
+        target_entity_id: str,
+        triggering_entity_id: str = None,
+        **service_data: Any,
+    ) -> ServiceResponse:
+        signature = self._signatures.get(service)
+        if not signature:
+            raise ValueError(f"Unknown service {service}")
+        signature.bind(target_entity_id, **service_data)
+
+        batch = self._batches.get(target_entity_id)
+        if batch is None:
+            batch = _PendingBatch()
+            batch.flush_handle = self._timer_wheel.schedule(
+                self._merge_window, self._async_flush, target_entity_id
+            )
+            self._batches[target_entity_id] = batch
+
+        kind = _COMMAND_KINDS.get(service, service)
+        # Re-inserting keeps the batch in the order of the latest submission per kind
+        superseded = batch.commands.pop(kind, None)
+        if superseded:
+            _LOGGER.debug(
+                "Command %s on %s supersedes pending %s",
+                service,
+                target_entity_id,
+                superseded[0],
+            )
+
+        batch.commands[kind] = (service, service_data, triggering_entity_id)
+        future = self._hass.loop.create_future()
+        batch.futures.setdefault(kind, []).append(future)
+
+        return await future
+
+    @callback
+    def cancel(self) -> None:
+        for batch in self._batches.values():
+            batch.flush_handle.cancel()
+            for futures in batch.futures.values():
+                for future in futures:
+                    if not future.done():
+                        future.cancel()
+        self._batches.clear()
+
+    @callback
+    def _async_flush(self, target_entity_id: str) -> None:
+        batch = self._batches.pop(target_entity_id, None)
+        if batch is None:
+            return
+
+        self._merge_hvac_mode_into_temperature(batch)
+        self._hass.async_create_task(self._async_execute(target_entity_id, batch))
+
+    def _merge_hvac_mode_into_temperature(self, batch: _PendingBatch) -> None:
+        temperature = batch.commands.get(_SET_TEMPERATURE)
+        mode = batch.commands.get(_MODE_KIND)
+        if not temperature or not mode or mode[0] != _SET_HVAC_MODE:
+            return
+
+        service, service_data, triggering_entity_id = temperature
+        kinds = list(batch.commands)
+        mode_is_newer = kinds.index(_MODE_KIND) > kinds.index(_SET_TEMPERATURE)
+        if mode_is_newer or service_data.get(_HVAC_MODE_KEY) is None:
+            service_data = {
+                **service_data,
+                _HVAC_MODE_KEY: mode[1].get(_HVAC_MODE_KEY),
+            }
+        batch.commands[_SET_TEMPERATURE] = (
+            service,
+            service_data,
+            triggering_entity_id,
+        )
+
+        del batch.commands[_MODE_KIND]
+        batch.futures[_SET_TEMPERATURE].extend(batch.futures.pop(_MODE_KIND))
+
+    async def _async_execute(self, target_entity_id: str, batch: _PendingBatch) -> None:
+        # Commands touching the HVAC mode run one after another in submission order
+        ordered = [
+            kind
+            for kind, (_, service_data, _) in batch.commands.items()
+            if kind == _MODE_KIND
+            or (kind == _SET_TEMPERATURE and service_data.get(_HVAC_MODE_KEY))
+        ]
+        for kind in ordered:
+            await self._async_execute_command(
+                target_entity_id, batch.commands.pop(kind), batch.futures[kind]
+            )
+
+        await asyncio.gather(
+            *(
+                self._async_execute_command(
+                    target_entity_id, command, batch.futures[kind]
+                )
+                for kind, command in batch.commands.items()
+            )
+        )
+
+    async def _async_execute_command(
+        self,
+        target_entity_id: str,
+        command: tuple[str, dict[str, Any], str | None],
+        futures: list[asyncio.Future],
+    ) -> None:
+        service, service_data, triggering_entity_id = command
+
+        try:
+            result = await self._handlers[service](
+                target_entity_id=target_entity_id,
+                triggering_entity_id=triggering_entity_id,
+                **service_data,
+            )
+        except Exception as ex:  # pylint: disable=broad-except
+            for future in futures:
+                if not future.done():
+                    future.set_exception(ex)
+            return
+
+        for future in futures:
+            if not future.done():
+                future.set_result(result)
@@ -9,11 +9,17 @@ from json.decoder import JSONDecodeError
 from voluptuous.error import Error
 
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.helpers import config_validation as cv, selector
 from homeassistant.helpers.service_info.mqtt import MqttServiceInfo
-from homeassistant.data_entry_flow import FlowResult, AbortFlow
+from homeassistant.data_entry_flow import FlowResult, FlowResultType, AbortFlow
 
-from .validators import validate_discovery_info, validate_config
+from .validators import (
+    validate_discovery_info,
+    validate_config,
+    normalize_discovery_info,
+)
+from .integration import HIDClimateControllerIntegration
 from .const import (
     DOMAIN,
     ENTITY_ID_KEY,
@@ -31,6 +37,7 @@ from .const import (
     UNKNOWN_EXCEPTION_ERROR,
     BASE_ERROR_PLACEHOLDER,
     DEVICE_CONFIG_UPDATED,
+    DISCOVERY_PAYLOAD_UNCHANGED,
     DEVICE_ALREADY_CONFIGURED_ERROR,
     MQTT_DISCOVERY_STEP_INVALID_DISCOVERY_PAYLOAD_ERROR,
     MQTT_DISCOVERY_STEP_DEVICE_VALIDATION_FAILURE_ERROR,
@@ -54,7 +61,9 @@ def generate_config_schema(data: dict[str, Any]) -> vol.Schema:
                 or "",
             ): cv.string,
             vol.Required(CLIMATE_ENTITY_ID_KEY): selector.EntitySelector(
-                selector.EntitySelectorConfig(domain=CLIMATE_ENTITY_TYPE),
+                selector.EntitySelectorConfig(
+                    domain=CLIMATE_ENTITY_TYPE, multiple=True
+                ),
             ),
         }
     )
@@ -63,9 +72,42 @@ def generate_config_schema(data: dict[str, Any]) -> vol.Schema:
 @config_entries.HANDLERS.register(DOMAIN)
 class HIDClimateControllerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     _discovery_config = None
+    _open_discovery_info = None
 
     async def async_step_mqtt(
         self, discovery_info: MqttServiceInfo | None = None
+    ) -> FlowResult:
+        discovery_gate = HIDClimateControllerIntegration.get_instance().discovery_gate
+        if not discovery_gate.async_begin(discovery_info):
+            return self.async_abort(reason=DISCOVERY_PAYLOAD_UNCHANGED)
+
+        processed = False
+        try:
+            result = await self._async_step_mqtt_discovery(discovery_info)
+            processed = (
+                result.get("reason") != MQTT_DISCOVERY_STEP_UNKNOWN_FAILURE_ERROR
+            )
+            if result.get("type") == FlowResultType.FORM:
+                # Not settled until the user submits the form, see async_remove
+                self._open_discovery_info = discovery_info
+            return result
+        finally:
+            queued_discovery_info = discovery_gate.async_end(discovery_info, processed)
+            if queued_discovery_info:
+                _LOGGER.debug(
+                    "Replaying coalesced MQTT discovery payload on topic %s",
+                    queued_discovery_info.topic,
+                )
+                self.hass.async_create_task(
+                    self.hass.config_entries.flow.async_init(
+                        DOMAIN,
+                        context={"source": config_entries.SOURCE_MQTT},
+                        data=queued_discovery_info,
+                    )
+                )
+
+    async def _async_step_mqtt_discovery(
+        self, discovery_info: MqttServiceInfo
     ) -> FlowResult:
         _LOGGER.debug(
             "Running async_step_mqtt to register device via MQTT discovery - discovery_info: %s",
@@ -86,6 +128,9 @@ class HIDClimateControllerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 raise Error
             _LOGGER.debug("Successfully validated MQTT discovery payload")
 
+            # Store the coerced values, consumers read the entry without the schema
+            discovery_config = normalize_discovery_info(discovery_config)
+
             unique_id = discovery_config[DEVICE_UNIQUE_ID_KEY]
             _LOGGER.debug(
                 "Extracted unique_id from MQTT discovery payload: %s", unique_id
@@ -167,6 +212,15 @@ class HIDClimateControllerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             return self.async_abort(reason=MQTT_DISCOVERY_STEP_UNKNOWN_FAILURE_ERROR)
 
+    @callback
+    def async_remove(self) -> None:
+        # A discovered flow closed without creating an entry must not mute its device
+        if self._open_discovery_info:
+            HIDClimateControllerIntegration.get_instance().discovery_gate.async_discard(
+                self._open_discovery_info
+            )
+            self._open_discovery_info = None
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -214,20 +268,32 @@ class HIDClimateControllerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         ),
                     }
 
-                    climate_entity_id = user_input.get(CLIMATE_ENTITY_ID_KEY)
-                    climate_states = self.hass.states.get(climate_entity_id)
-                    climate_friendly_name = climate_states.attributes.get(
-                        FRIENDLY_NAME_KEY, climate_entity_id
-                    )
-
-                    climate_config = {
-                        ENTITY_ID_KEY: climate_entity_id,
-                        FRIENDLY_NAME_KEY: climate_friendly_name,
-                    }
-
+                    climate_configs = []
+                    for climate_entity_id in cv.ensure_list(
+                        user_input.get(CLIMATE_ENTITY_ID_KEY)
+                    ):
+                        climate_state = self.hass.states.get(climate_entity_id)
+                        climate_configs.append(
+                            {
+                                ENTITY_ID_KEY: climate_entity_id,
+                                FRIENDLY_NAME_KEY: (
+                                    climate_state.attributes.get(
+                                        FRIENDLY_NAME_KEY, climate_entity_id
+                                    )
+                                    if climate_state
+                                    else climate_entity_id
+                                ),
+                            }
+                        )
+
+                    # Single zone entries keep the original mapping layout
                     config = {
                         CONTROLLER_KEY: controller_config,
-                        CLIMATE_KEY: climate_config,
+                        CLIMATE_KEY: (
+                            climate_configs[0]
+                            if len(climate_configs) == 1
+                            else climate_configs
+                        ),
                     }
 
                     _LOGGER.debug(
@@ -235,9 +301,10 @@ class HIDClimateControllerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         config,
                     )
 
+                    self._open_discovery_info = None
                     return self.async_create_entry(
                         title=config.get(CONTROLLER_KEY, {}).get(ENTITY_ID_KEY),
-                        description=f"Linked to {config.get(CLIMATE_KEY, {}).get(FRIENDLY_NAME_KEY) or config.get(CLIMATE_KEY, {}).get(ENTITY_ID_KEY)}",
+                        description=f"Linked to {', '.join(climate_config[FRIENDLY_NAME_KEY] for climate_config in climate_configs)}",
                         data=config,
                     )
                 except AbortFlow as ex:
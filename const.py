@@ -2,10 +2,67 @@ import re
 
 DOMAIN = "hid_climate_controller"
 
+DISCOVERY_TOPIC_UNIQUE_ID_LEVEL = 2
+
 STATE_TOPIC = "homeassistant/hid_climate_controller/{unique_id}/state"
 COMMAND_TOPIC = (
     "homeassistant/hid_climate_controller/{unique_id}/services/{{service_name}}"
 )
+COMMAND_TOPIC_FILTER = "homeassistant/hid_climate_controller/+/services/+"
+COMMAND_ACK_TOPIC = (
+    "homeassistant/hid_climate_controller/{unique_id}/services/{service_name}/ack"
+)
+STATE_FULL_REQUEST_TOPIC_FILTER = "homeassistant/hid_climate_controller/+/state/full"
+AVAILABILITY_TOPIC_FILTER = "homeassistant/hid_climate_controller/+/availability"
+AVAILABILITY_ONLINE = "online"
+AVAILABILITY_OFFLINE = "offline"
+LIVENESS_TIMEOUT = 90
+SIGNAL_DEVICE_AVAILABILITY = "hid_climate_controller_availability_{unique_id}"
+
+MESSAGE_ID_KEY = "message_id"
+ACK_SUCCESS_KEY = "success"
+ACK_ERROR_KEY = "error"
+COMMAND_ZONE_KEY = "zone"
+
+COMMAND_MERGE_WINDOW = 0.3
+
+DEVICE_REGISTRATION_BATCH_WINDOW = 0.05
+DEVICE_REGISTRATION_PARALLELISM = 32
+
+STATE_PUBLISH_MIN_INTERVAL = 0.5
+STATE_PUBLISH_MAX_LATENCY = 2.0
+STATE_PUBLISH_QOS = 0
+
+PUBLISH_PRIORITY_ACK = 0
+PUBLISH_PRIORITY_INTERACTIVE = 1
+PUBLISH_PRIORITY_STATE = 2
+PUBLISH_RATE_LIMIT = 100.0
+PUBLISH_BURST = 50
+PUBLISH_MAX_IN_FLIGHT = 32
+
+TIMER_WHEEL_RESOLUTION = 0.001
+TIMER_WHEEL_LEVEL_BITS = (8, 6, 6, 6)
+
+CONTROLLER_MAILBOX_SIZE = 16
+MAILBOX_POLICY_COALESCE = "coalesce"
+MAILBOX_POLICY_DROP_OLDEST = "drop_oldest"
+
+WIRE_FORMAT_JSON = "json"
+WIRE_FORMAT_MSGPACK = "msgpack"
+
+STATE_PAYLOAD_TYPE_KEY = "type"
+STATE_PAYLOAD_TYPE_FULL = "full"
+STATE_PAYLOAD_TYPE_DELTA = "delta"
+STATE_PAYLOAD_TYPE_CONFIRM = "confirm"
+STATE_SEQUENCE_KEY = "seq"
+STATE_BASE_SEQUENCE_KEY = "base"
+STATE_VALUE_KEY = "s"
+STATE_ATTRIBUTES_KEY = "a"
+STATE_REMOVED_ATTRIBUTES_KEY = "r"
+STATE_ZONES_KEY = "zones"
+STATE_METADATA_KEYS = ("c", "lc", "lu")
+
+ECHO_SUPPRESSION_WINDOW = 5.0
 
 DEVICE_UNIQUE_ID_REGEX = re.compile(r"^HW-THID-[A-Za-z0-9]{17}$", re.IGNORECASE)
 DEVICE_SW_VERSION_REGEX = re.compile(r"^\d+\.\d+\.\d+$")
@@ -24,6 +81,13 @@ DEVICE_MANUFACTURER_KEY = "manufacturer"
 DEVICE_SW_VERSION_KEY = "sw_version"
 DEVICE_HW_VERSION_KEY = "hw_version"
 DEVICE_DEFERRED_REGISTRATION_KEY = "deferred_registration"
+DEVICE_STATE_MIN_INTERVAL_KEY = "state_min_interval"
+DEVICE_STATE_MAX_LATENCY_KEY = "state_max_latency"
+DEVICE_STATE_QOS_KEY = "state_qos"
+DEVICE_WIRE_FORMAT_KEY = "wire_format"
+DEVICE_MAILBOX_POLICY_KEY = "mailbox_policy"
+DEVICE_FIELDS_KEY = "fields"
+DEVICE_ECHO_SUPPRESSION_KEY = "echo_suppression"
 
 CONTROLLER_KEY = "controller"
 CONTROLLER_ENTITY_ID_KEY = "controller_entity_id"
@@ -32,6 +96,31 @@ CLIMATE_ENTITY_TYPE = "climate"
 CLIMATE_KEY = "climate"
 CLIMATE_ENTITY_ID_KEY = "climate_entity_id"
 
+LOG_SAMPLING_INTERVAL = 10.0
+
+STATE_STORE_KEY = f"{DOMAIN}.last_known_state"
+STATE_STORE_VERSION = 1
+STATE_STORE_SAVE_DELAY = 10
+STATE_STORE_STATE_KEY = "state"
+STATE_STORE_SEQUENCE_KEY = "seq"
+
+METRIC_STATE_EVENTS_HANDLED = "state_events_handled"
+METRIC_FAN_OUT_TIME = "fan_out_time"
+METRIC_PUBLISH_QUEUE_DEPTH = "publish_queue_depth"
+METRIC_STATES_PUBLISHED = "states_published"
+METRIC_STATES_COALESCED = "states_coalesced"
+METRIC_COMMAND_ACK_LATENCY = "command_ack_latency"
+METRIC_COMMANDS_FAILED = "commands_failed"
+METRIC_SERVICE_CALL_LATENCY = "service_call_latency"
+METRIC_DEVICE_REGISTRATION_BATCH_TIME = "device_registration_batch_time"
+METRIC_MAILBOX_DEPTH = "mailbox_depth"
+METRIC_MAILBOX_OVERFLOWS = "mailbox_overflows"
+METRIC_ECHOES_CONFIRMED = "echoes_confirmed"
+METRIC_ECHO_CORRECTIONS = "echo_corrections"
+METRIC_PUBLISH_BACKLOG = "publish_backlog"
+METRIC_PUBLISH_WAIT_TIME = "publish_wait_time"
+METRIC_STATES_SKIPPED_OFFLINE = "states_skipped_offline"
+
 # Errors
 UNKNOWN_EXCEPTION_ERROR = "Unknown exception encountered. Check logs for details."
 
@@ -41,6 +130,7 @@ INVALID_UNIQUE_ID_FORMAT_ERROR = "INVALID_UNIQUE_ID_FORMAT"
 MULTIPLE_VALIDATION_ERRORS = "MULTIPLE_VALIDATION_ERRORS"
 
 DEVICE_CONFIG_UPDATED = "device_config_updated"
+DISCOVERY_PAYLOAD_UNCHANGED = "discovery_payload_unchanged"
 DEVICE_ALREADY_CONFIGURED_ERROR = "already_configured"
 DEVICE_VALIDATION_UNIQUE_ID_INVALID_ERROR = "DEVICE_VALIDATION_UNIQUE_ID_INVALID_ERROR"
 MQTT_DISCOVERY_STEP_INVALID_DISCOVERY_PAYLOAD_ERROR = (
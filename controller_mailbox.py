@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import logging
+import asyncio
+
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+from homeassistant.core import HomeAssistant, callback
+
+from .metrics import MetricsRegistry
+from .log_sampling import SampledLogger
+from .const import (
+    DOMAIN,
+    CONTROLLER_MAILBOX_SIZE,
+    MAILBOX_POLICY_COALESCE,
+    METRIC_MAILBOX_DEPTH,
+    METRIC_MAILBOX_OVERFLOWS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+_SAMPLED_LOGGER = SampledLogger(_LOGGER)
+
+
+class ControllerMailbox:
+    """Bounded queue drained by its own worker task, so a slow consumer only delays itself.
+
+    When the mailbox is full the newest item is either merged into the last queued
+    one (coalesce) or the oldest queued item is discarded (drop_oldest).
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        handler: Callable[[Any], Awaitable[None]],
+        max_size: int = CONTROLLER_MAILBOX_SIZE,
+        policy: str = MAILBOX_POLICY_COALESCE,
+        merge: Callable[[Any, Any], Any] | None = None,
+    ) -> None:
+        self._hass = hass
+        self._name = name
+        self._handler = handler
+        self._max_size = max(1, max_size)
+        self._policy = policy
+        self._merge = merge
+        self._queue = deque()
+        self._wakeup = asyncio.Event()
+        self._worker = None
+
+        metrics = MetricsRegistry.get_instance()
+        self._depth = metrics.gauge(METRIC_MAILBOX_DEPTH, name)
+        self._overflows = metrics.counter(METRIC_MAILBOX_OVERFLOWS, name)
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    @callback
+    def start(self) -> None:
+        if self._worker is None:
+            self._worker = self._hass.async_create_background_task(
+                self._async_run(), f"{DOMAIN} mailbox {self._name}"
+            )
+
+    @callback
+    def put(self, item: Any) -> None:
+        if len(self._queue) >= self._max_size:
+            self._overflows.increment()
+            _SAMPLED_LOGGER.debug(
+                self._name,
+                "Mailbox %s is full (%d items). Applying %s policy",
+                self._name,
+                len(self._queue),
+                self._policy,
+            )
+            if self._policy == MAILBOX_POLICY_COALESCE:
+                self._queue[-1] = (
+                    self._merge(self._queue[-1], item) if self._merge else item
+                )
+            else:
+                self._queue.popleft()
+                self._queue.append(item)
+        else:
+            self._queue.append(item)
+
+        self._depth.set(len(self._queue))
+        self._wakeup.set()
+
+    @callback
+    def clear(self) -> None:
+        self._queue.clear()
+        self._depth.set(0)
+
+    @callback
+    def cancel(self) -> None:
+        if self._worker:
+            self._worker.cancel()
+            self._worker = None
+
+        self.clear()
+        _SAMPLED_LOGGER.forget(self._name)
+
+    async def _async_run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            while self._queue:
+                item = self._queue.popleft()
+                self._depth.set(len(self._queue))
+                try:
+                    await self._handler(item)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Mailbox %s failed to handle an item", self._name)
@@ -4,30 +4,97 @@ import logging
 
 from typing import Any
 
-from homeassistant.core import HomeAssistant, Event, State
-from homeassistant.components import mqtt
+from homeassistant.core import HomeAssistant, callback
 
-from .utilities import Utilities, async_throttle
+from .utilities import Utilities
+from .state_publisher import CoalescingStatePublisher
+from .controller_mailbox import ControllerMailbox
+from .publish_scheduler import PublishScheduler
+from .state_delta import (
+    merge_state_payloads,
+    merge_zones_payloads,
+    build_zones_payload,
+)
+from .metrics import MetricsRegistry
+from .log_sampling import SampledLogger
+from .wire_format import JsonWireFormat, MsgpackWireFormat, get_wire_format
 from .const import (
     STATE_TOPIC,
     COMMAND_TOPIC,
-    TRIGGERING_ENTITY_ULID_KEY,
+    STATE_PUBLISH_MIN_INTERVAL,
+    STATE_PUBLISH_MAX_LATENCY,
+    STATE_PUBLISH_QOS,
+    CONTROLLER_MAILBOX_SIZE,
+    MAILBOX_POLICY_COALESCE,
+    DEVICE_KEY,
+    DEVICE_STATE_MIN_INTERVAL_KEY,
+    DEVICE_STATE_MAX_LATENCY_KEY,
+    DEVICE_STATE_QOS_KEY,
+    DEVICE_WIRE_FORMAT_KEY,
+    DEVICE_MAILBOX_POLICY_KEY,
+    DEVICE_FIELDS_KEY,
+    DEVICE_ECHO_SUPPRESSION_KEY,
     TRIGGERING_ENTITY_ID_KEY,
     ENTITY_ID_KEY,
+    METRIC_STATES_SKIPPED_OFFLINE,
 )
 
 _LOGGER = logging.getLogger(__name__)
+_SAMPLED_LOGGER = SampledLogger(_LOGGER)
 
 
 class DeviceController:
-    def __init__(self, hass: HomeAssistant, config: dict[str, Any]) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config: dict[str, Any],
+        publish_scheduler: PublishScheduler,
+        zones: list[str] | None = None,
+    ) -> None:
         self._hass = hass
         self._config = config
+        self._zones = list(zones or [])
+        self._multiplexed = len(self._zones) > 1
+        self._available = True
         self._entity_id = self._config.get(ENTITY_ID_KEY)
         self._entity_id_ulid = Utilities.encode_string_as_ulid(self._entity_id)
         self._state_topic = STATE_TOPIC.format(unique_id=self._entity_id)
         self._command_topic = COMMAND_TOPIC.format(unique_id=self._entity_id)
 
+        device_config = self._config.get(DEVICE_KEY, {})
+        merge = merge_zones_payloads if self._multiplexed else merge_state_payloads
+        self._fields = frozenset(device_config.get(DEVICE_FIELDS_KEY) or ()) or None
+        self._echo_suppression = bool(device_config.get(DEVICE_ECHO_SUPPRESSION_KEY))
+        self._wire_format = get_wire_format(device_config.get(DEVICE_WIRE_FORMAT_KEY))
+        self._state_publisher = CoalescingStatePublisher(
+            self._hass,
+            self._state_topic,
+            publish_scheduler,
+            min_interval=device_config.get(
+                DEVICE_STATE_MIN_INTERVAL_KEY, STATE_PUBLISH_MIN_INTERVAL
+            ),
+            max_latency=device_config.get(
+                DEVICE_STATE_MAX_LATENCY_KEY, STATE_PUBLISH_MAX_LATENCY
+            ),
+            qos=device_config.get(DEVICE_STATE_QOS_KEY, STATE_PUBLISH_QOS),
+            wire_format=self._wire_format,
+            merge=merge,
+            metrics_label=self._entity_id,
+        )
+        self._mailbox = ControllerMailbox(
+            self._hass,
+            self._entity_id,
+            self.state_changed,
+            max_size=CONTROLLER_MAILBOX_SIZE,
+            policy=device_config.get(
+                DEVICE_MAILBOX_POLICY_KEY, MAILBOX_POLICY_COALESCE
+            ),
+            merge=merge,
+        )
+        self._states_skipped_offline = MetricsRegistry.get_instance().counter(
+            METRIC_STATES_SKIPPED_OFFLINE, self._entity_id
+        )
+
     async def initialize(self) -> None:
         _LOGGER.info(
             "Initializing device controller %s (%s)",
@@ -35,19 +102,88 @@ class DeviceController:
             self._entity_id_ulid,
         )
 
-    def matches(self, ulid: str) -> bool:
-        return ulid == self._entity_id_ulid
+        self._mailbox.start()
 
-    async def state_changed(self, state: dict[str, Any]) -> None:
-        triggering_entity_id = state.get(TRIGGERING_ENTITY_ID_KEY)
+    @property
+    def entity_id(self) -> str:
+        return self._entity_id
 
-        _LOGGER.info(
+    @property
+    def wire_format(self) -> JsonWireFormat | MsgpackWireFormat:
+        return self._wire_format
+
+    @property
+    def entity_id_ulid(self) -> str:
+        return self._entity_id_ulid
+
+    @property
+    def zones(self) -> list[str]:
+        return self._zones
+
+    @property
+    def multiplexed(self) -> bool:
+        return self._multiplexed
+
+    @property
+    def fields(self) -> frozenset[str] | None:
+        return self._fields
+
+    @property
+    def echo_suppression(self) -> bool:
+        return self._echo_suppression
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @callback
+    def set_available(self, available: bool) -> None:
+        if available == self._available:
+            return
+
+        self._available = available
+        if not available:
+            # Nobody is listening, the device gets a full snapshot when it returns
+            self._mailbox.clear()
+            self._state_publisher.cancel()
+
+    @callback
+    def enqueue_state(self, state: dict[str, Any], zone: str | None = None) -> None:
+        if not self._available:
+            self._states_skipped_offline.increment()
+            return
+
+        if self._multiplexed:
+            self._mailbox.put(build_zones_payload({zone: state}))
+        else:
+            self._mailbox.put(state)
+
+    @callback
+    def enqueue_zone_states(self, states: dict[str, dict[str, Any]]) -> None:
+        if not self._available:
+            self._states_skipped_offline.increment()
+            return
+
+        if self._multiplexed:
+            self._mailbox.put(build_zones_payload(states))
+            return
+
+        for state in states.values():
+            self._mailbox.put(state)
+
+    async def state_changed(self, state: dict[str, Any]) -> None:
+        _SAMPLED_LOGGER.debug(
+            self._entity_id,
             "Device controller %s (%s) is handling state changed event triggered by %s with data: %s",
             self._entity_id,
             self._entity_id_ulid,
-            triggering_entity_id,
+            state.get(TRIGGERING_ENTITY_ID_KEY),
             state,
         )
 
+        self._state_publisher.publish(state)
+
     async def destroy(self) -> None:
-        return None
+        self._mailbox.cancel()
+        self._state_publisher.cancel()
+        _SAMPLED_LOGGER.forget(self._entity_id)
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .metrics import MetricsRegistry
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    return {
+        "entry": dict(entry.data),
+        "metrics": MetricsRegistry.get_instance().as_dict(),
+    }
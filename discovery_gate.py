@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import callback
+
+from .const import DISCOVERY_TOPIC_UNIQUE_ID_LEVEL
+
+
+class DiscoveryGate:
+    """Drops repeated discovery announcements before they are parsed or validated.
+
+    Identical payloads for a known unique_id are rejected outright. A changed
+    payload that arrives while another one for the same device is being handled
+    is queued, and only the latest queued payload is replayed afterwards.
+    """
+
+    def __init__(self) -> None:
+        self._payload_hashes = {}
+        self._in_progress = set()
+        self._queued = {}
+
+    @callback
+    def async_begin(self, discovery_info: Any) -> bool:
+        unique_id = self._get_unique_id(discovery_info.topic)
+        payload_hash = hash(discovery_info.payload)
+
+        if self._payload_hashes.get(unique_id) == payload_hash:
+            self._queued.pop(unique_id, None)
+            return False
+
+        if unique_id in self._in_progress:
+            self._queued[unique_id] = discovery_info
+            return False
+
+        self._in_progress.add(unique_id)
+        self._payload_hashes[unique_id] = payload_hash
+        return True
+
+    @callback
+    def async_end(self, discovery_info: Any, processed: bool = True) -> Any | None:
+        unique_id = self._get_unique_id(discovery_info.topic)
+
+        self._in_progress.discard(unique_id)
+        if not processed:
+            self._payload_hashes.pop(unique_id, None)
+
+        return self._queued.pop(unique_id, None)
+
+    @callback
+    def async_discard(self, discovery_info: Any) -> None:
+        unique_id = self._get_unique_id(discovery_info.topic)
+        if self._payload_hashes.get(unique_id) == hash(discovery_info.payload):
+            del self._payload_hashes[unique_id]
+
+    @callback
+    def async_forget(self, unique_id: str) -> None:
+        self._payload_hashes.pop(unique_id, None)
+
+    def _get_unique_id(self, topic: str) -> str:
+        return topic.split("/")[DISCOVERY_TOPIC_UNIQUE_ID_LEVEL]
@@ -1,17 +1,32 @@
 from __future__ import annotations
 
 import logging
+import asyncio
+import time
 
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, Event, callback
+from homeassistant.const import EVENT_STATE_CHANGED, Platform
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.components import mqtt
 
-from .concurrent_dict import ConcurrentDict
+from .async_registry import AsyncRegistry
 from .climate_service import ClimateService
 from .climate_commands import ClimateCommands
 from .climate_bridge import ClimateBridge
+from .publish_scheduler import PublishScheduler
+from .command_router import MqttCommandRouter
+from .liveness_tracker import LivenessTracker
+from .command_scheduler import ClimateCommandScheduler
+from .device_controller import DeviceController
+from .utilities import Utilities
+from .metrics import MetricsRegistry
+from .state_store import LastKnownStateStore
+from .discovery_gate import DiscoveryGate
+from .timer_wheel import TimerWheel
 from .const import (
     DOMAIN,
     ENTITY_ID_KEY,
@@ -23,11 +38,19 @@ from .const import (
     DEVICE_HW_VERSION_KEY,
     DEVICE_DEFERRED_REGISTRATION_KEY,
     CONTROLLER_KEY,
-    CLIMATE_KEY,
+    DEVICE_REGISTRATION_BATCH_WINDOW,
+    DEVICE_REGISTRATION_PARALLELISM,
+    METRIC_DEVICE_REGISTRATION_BATCH_TIME,
+    SIGNAL_DEVICE_AVAILABILITY,
+    STATE_FULL_REQUEST_TOPIC_FILTER,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+_UNIQUE_ID_TOPIC_LEVEL = 2
+
+PLATFORMS = [Platform.BINARY_SENSOR, Platform.SENSOR]
+
 
 class HIDClimateControllerIntegration:
     _instance = None
@@ -35,10 +58,21 @@ class HIDClimateControllerIntegration:
     _initialized = False
     _hass = None
     _device_discovery_topic = None
-    _pending_device_registrations = ConcurrentDict()
+    _discovery_gate = DiscoveryGate()
+    _pending_device_registrations = AsyncRegistry()
+    _device_registrations_flush_handle = None
     _climate_service = None
     _climate_commands = None
-    _climate_bridges = ConcurrentDict()
+    _climate_command_scheduler = None
+    _publish_scheduler = None
+    _mqtt_command_router = None
+    _liveness_tracker = None
+    _state_store = None
+    _climate_bridges = AsyncRegistry()
+    _climate_bridges_by_controller = {}
+    _device_controllers = AsyncRegistry()
+    _unsubscribe_state_changed = None
+    _unsubscribe_full_state_request = None
 
     @staticmethod
     def get_instance():
@@ -59,9 +93,51 @@ class HIDClimateControllerIntegration:
         self._hass = hass
         self._climate_service = ClimateService(self._hass)
         self._climate_commands = ClimateCommands(self._climate_service)
+        self._publish_scheduler = PublishScheduler(self._hass)
+        self._state_store = LastKnownStateStore(self._hass)
+        self._climate_command_scheduler = ClimateCommandScheduler(
+            self._hass, self._climate_commands
+        )
+        self._mqtt_command_router = MqttCommandRouter(
+            self._hass,
+            self._publish_scheduler,
+            self._climate_command_scheduler,
+            self._device_controllers.get,
+            self._climate_bridges_by_controller.get,
+        )
+        self._liveness_tracker = LivenessTracker(
+            self._hass, self._async_device_availability_changed
+        )
         self._hass.data.setdefault(DOMAIN, self)
+        self._unsubscribe_state_changed = self._hass.bus.async_listen(
+            EVENT_STATE_CHANGED, self._async_dispatch_state_changed
+        )
+
+        if await mqtt.async_wait_for_mqtt_client(self._hass):
+            await self._mqtt_command_router.start()
+            await self._liveness_tracker.start()
+            self._unsubscribe_full_state_request = await mqtt.async_subscribe(
+                self._hass,
+                STATE_FULL_REQUEST_TOPIC_FILTER,
+                self._async_handle_full_state_request,
+                1,
+                encoding=None,
+            )
+        else:
+            _LOGGER.error(
+                "MQTT integration is not available. Commands, heartbeats and full state requests will not be received"
+            )
+
         self._initialized = True
 
+    @property
+    def liveness_tracker(self) -> LivenessTracker:
+        return self._liveness_tracker
+
+    @property
+    def discovery_gate(self) -> DiscoveryGate:
+        return self._discovery_gate
+
     async def async_setup_entry(self, entry: ConfigEntry) -> bool:
         _LOGGER.debug("Running async_setup_entry for config entry data: %s", entry.data)
 
@@ -72,7 +148,8 @@ class HIDClimateControllerIntegration:
         if device_deferred_registration:
             return True
 
-        await self._async_register_device(entry)
+        await self._async_enqueue_device_registration(entry)
+        await self._hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
         return True
 
@@ -81,6 +158,8 @@ class HIDClimateControllerIntegration:
             "Running async_unload_entry for config entry data: %s", entry.data
         )
 
+        self._discovery_gate.async_forget(entry.unique_id)
+
         device_deferred_registration = entry.data.get(CONTROLLER_KEY, {}).get(
             DEVICE_DEFERRED_REGISTRATION_KEY, True
         )
@@ -88,24 +167,99 @@ class HIDClimateControllerIntegration:
         if device_deferred_registration:
             return True
 
+        unload_ok = await self._hass.config_entries.async_unload_platforms(
+            entry, PLATFORMS
+        )
         await self._async_unregister_device(entry)
 
-        return True
+        return unload_ok
+
+    async def _async_enqueue_device_registration(self, entry: ConfigEntry) -> None:
+        registration = self._hass.loop.create_future()
+        self._pending_device_registrations.set(entry.entry_id, (entry, registration))
+
+        if not self._device_registrations_flush_handle:
+            self._device_registrations_flush_handle = (
+                TimerWheel.get_instance().schedule(
+                    DEVICE_REGISTRATION_BATCH_WINDOW,
+                    self._async_flush_device_registrations,
+                )
+            )
+
+        await registration
+
+    @callback
+    def _async_flush_device_registrations(self) -> None:
+        self._device_registrations_flush_handle = None
+
+        pending = []
+        for entry_id in self._pending_device_registrations.keys():
+            pending.append(self._pending_device_registrations.pop(entry_id))
+
+        self._hass.async_create_task(self._async_register_devices(pending))
+
+    async def _async_register_devices(
+        self, pending: list[tuple[ConfigEntry, asyncio.Future]]
+    ) -> None:
+        try:
+            results = await self._async_register_device_batch(
+                [entry for entry, _ in pending]
+            )
+        except Exception as ex:  # pylint: disable=broad-except
+            results = [ex] * len(pending)
+
+        for (_, registration), result in zip(pending, results):
+            if registration.done():
+                continue
+            if isinstance(result, BaseException):
+                registration.set_exception(result)
+            else:
+                registration.set_result(result)
+
+    async def _async_register_device_batch(
+        self, entries: list[ConfigEntry]
+    ) -> list[DeviceController | BaseException | None]:
+        _LOGGER.debug("Registering a batch of %d devices", len(entries))
+        started_at = time.perf_counter()
 
-    async def _async_register_device(self, entry: ConfigEntry) -> None:
-        _LOGGER.debug("Running async_register_device for config entry: %s", entry)
+        device_registry = dr.async_get(self._hass)
+        for entry in entries:
+            self._async_create_device(device_registry, entry)
 
-        controller_config = entry.data.get(CONTROLLER_KEY, {})
-        climate_config = entry.data.get(CLIMATE_KEY, {})
+        parallelism = asyncio.Semaphore(DEVICE_REGISTRATION_PARALLELISM)
 
-        if len(controller_config) == 0 or len(climate_config) == 0:
-            return
+        async def register_device(entry: ConfigEntry) -> DeviceController | None:
+            async with parallelism:
+                return await self._async_register_device(entry)
 
-        climate_entity_id = climate_config.get(ENTITY_ID_KEY)
-        if not climate_entity_id:
-            return
+        results = await asyncio.gather(
+            *(register_device(entry) for entry in entries),
+            return_exceptions=True,
+        )
 
-        device_registry = dr.async_get(self._hass)
+        for result in results:
+            if isinstance(result, DeviceController):
+                self._async_publish_full_state(result)
+
+        elapsed = time.perf_counter() - started_at
+        MetricsRegistry.get_instance().histogram(
+            METRIC_DEVICE_REGISTRATION_BATCH_TIME
+        ).record(elapsed)
+        _LOGGER.debug(
+            "Registered a batch of %d devices in %.3fs", len(entries), elapsed
+        )
+
+        return results
+
+    @callback
+    def _async_create_device(
+        self, device_registry: dr.DeviceRegistry, entry: ConfigEntry
+    ) -> None:
+        controller_config = entry.data.get(CONTROLLER_KEY, {})
+        climate_configs = Utilities.get_climate_configs(entry.data)
+
+        if len(controller_config) == 0 or len(climate_configs) == 0:
+            return
 
         device_data = controller_config.get(DEVICE_KEY, {})
 
@@ -119,37 +273,152 @@ class HIDClimateControllerIntegration:
             hw_version=device_data.get(DEVICE_HW_VERSION_KEY),
         )
 
-        climate_bridge = self._climate_bridges.setdefault_with_func_construct(
-            climate_entity_id,
-            lambda: ClimateBridge(
+    async def _async_register_device(
+        self, entry: ConfigEntry
+    ) -> DeviceController | None:
+        _LOGGER.debug("Running async_register_device for config entry: %s", entry)
+
+        controller_config = entry.data.get(CONTROLLER_KEY, {})
+        climate_configs = [
+            climate_config
+            for climate_config in Utilities.get_climate_configs(entry.data)
+            if climate_config.get(ENTITY_ID_KEY)
+        ]
+
+        if len(controller_config) == 0 or len(climate_configs) == 0:
+            return None
+
+        controller_entity_id = controller_config.get(ENTITY_ID_KEY)
+        if not controller_entity_id:
+            return None
+
+        async def build_device_controller() -> DeviceController:
+            device_controller = DeviceController(
                 self._hass,
-                self._climate_commands,
-                self._async_climate_bridge_removal_requested,
-                climate_config,
-            ),
+                controller_config,
+                self._publish_scheduler,
+                zones=[
+                    climate_config[ENTITY_ID_KEY] for climate_config in climate_configs
+                ],
+            )
+            device_controller.set_available(
+                self._liveness_tracker.is_available(controller_entity_id)
+            )
+            await device_controller.initialize()
+            return device_controller
+
+        device_controller = (
+            await self._device_controllers.async_setdefault_with_func_construct(
+                controller_entity_id, build_device_controller
+            )
         )
 
-        return await climate_bridge.register_controller(controller_config)
+        climate_bridges = self._climate_bridges_by_controller.setdefault(
+            controller_entity_id, {}
+        )
+        for climate_config in climate_configs:
+            climate_entity_id = climate_config[ENTITY_ID_KEY]
+
+            async def build_climate_bridge(
+                climate_config: dict[str, Any] = climate_config,
+            ) -> ClimateBridge:
+                climate_bridge = ClimateBridge(
+                    self._hass,
+                    self._climate_commands,
+                    self._async_climate_bridge_removal_requested,
+                    climate_config,
+                    self._state_store,
+                )
+                await climate_bridge.async_restore()
+                return climate_bridge
+
+            climate_bridge = (
+                await self._climate_bridges.async_setdefault_with_func_construct(
+                    climate_entity_id, build_climate_bridge
+                )
+            )
+            climate_bridge.register_controller(device_controller)
+            climate_bridges[climate_entity_id] = climate_bridge
+
+        return device_controller
 
     async def _async_unregister_device(self, entry: ConfigEntry) -> None:
         controller_config = entry.data.get(CONTROLLER_KEY, {})
-        climate_config = entry.data.get(CLIMATE_KEY, {})
-        if len(controller_config) == 0 or len(climate_config) == 0:
+        if len(controller_config) == 0:
             return
 
         unique_id = controller_config.get(ENTITY_ID_KEY)
         if not unique_id:
             return
 
-        climate_entity_id = climate_config.get(ENTITY_ID_KEY)
-        if not climate_entity_id:
+        climate_bridges = self._climate_bridges_by_controller.pop(unique_id, {})
+        for climate_bridge in climate_bridges.values():
+            await climate_bridge.unregister_controller(unique_id)
+
+        device_controller = self._device_controllers.pop(unique_id)
+        if device_controller:
+            _LOGGER.debug("Destroying device controller: %s", unique_id)
+            await device_controller.destroy()
+
+    @callback
+    def _async_publish_full_state(self, device_controller: DeviceController) -> None:
+        climate_bridges = self._climate_bridges_by_controller.get(
+            device_controller.entity_id, {}
+        )
+        _LOGGER.debug(
+            "Publishing full state of %s to device controller %s",
+            list(climate_bridges),
+            device_controller.entity_id,
+        )
+        device_controller.enqueue_zone_states(
+            {
+                climate_entity_id: climate_bridge.get_full_state_payload(
+                    device_controller
+                )
+                for climate_entity_id, climate_bridge in climate_bridges.items()
+            }
+        )
+
+    @callback
+    def _async_handle_full_state_request(self, msg) -> None:
+        unique_id = msg.topic.split("/")[_UNIQUE_ID_TOPIC_LEVEL]
+        device_controller = self._device_controllers.get(unique_id)
+        if not device_controller:
+            _LOGGER.debug(
+                "Received full state request from unregistered device controller %s",
+                unique_id,
+            )
+            return
+
+        _LOGGER.debug("Device controller %s requested a full state snapshot", unique_id)
+        self._async_publish_full_state(device_controller)
+
+    @callback
+    def _async_device_availability_changed(
+        self, unique_id: str, available: bool
+    ) -> None:
+        async_dispatcher_send(
+            self._hass,
+            SIGNAL_DEVICE_AVAILABILITY.format(unique_id=unique_id),
+            available,
+        )
+
+        device_controller = self._device_controllers.get(unique_id)
+        if not device_controller:
             return
 
-        climate_bridge = self._climate_bridges.get(climate_entity_id)
+        device_controller.set_available(available)
+        if available:
+            # Whatever changed while the device was away is only covered by a full snapshot
+            self._async_publish_full_state(device_controller)
+
+    @callback
+    def _async_dispatch_state_changed(self, event: Event) -> None:
+        climate_bridge = self._climate_bridges.get(event.data.get(ENTITY_ID_KEY))
         if not climate_bridge:
             return
 
-        await climate_bridge.unregister_controller(controller_config)
+        climate_bridge.async_handle_state_changed(event)
 
     async def _async_climate_bridge_removal_requested(self, entity_id: str) -> None:
         if not entity_id:
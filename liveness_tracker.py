@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import logging
+
+from typing import Callable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.components import mqtt
+
+from .timer_wheel import TimerWheel, TimerWheelHandle
+from .const import (
+    AVAILABILITY_TOPIC_FILTER,
+    AVAILABILITY_ONLINE,
+    AVAILABILITY_OFFLINE,
+    LIVENESS_TIMEOUT,
+)
+
+_UNIQUE_ID_TOPIC_LEVEL = 2
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LivenessTracker:
+    """Tracks device availability from heartbeats received on a single wildcard subscription.
+
+    Every heartbeat re-arms the device deadline on the shared timer wheel. A device
+    goes offline when its deadline expires or its last will is published, and
+    devices that never published a heartbeat are assumed to be online.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        availability_changed_callback: Callable[[str, bool], None],
+        timeout: float = LIVENESS_TIMEOUT,
+    ) -> None:
+        self._hass = hass
+        self._availability_changed_callback = availability_changed_callback
+        self._timeout = timeout
+        self._available = {}
+        self._deadlines: dict[str, TimerWheelHandle] = {}
+        self._timer_wheel = TimerWheel.get_instance()
+        self._unsubscribe = None
+
+    async def start(self) -> None:
+        if self._unsubscribe:
+            return
+
+        _LOGGER.debug(
+            "Subscribing to availability topic filter %s", AVAILABILITY_TOPIC_FILTER
+        )
+        self._unsubscribe = await mqtt.async_subscribe(
+            self._hass,
+            AVAILABILITY_TOPIC_FILTER,
+            self._async_handle_availability,
+            1,
+            encoding=None,
+        )
+
+    async def stop(self) -> None:
+        if self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+        for deadline in self._deadlines.values():
+            deadline.cancel()
+        self._deadlines.clear()
+
+    def is_available(self, unique_id: str) -> bool:
+        return self._available.get(unique_id, True)
+
+    @callback
+    def _async_handle_availability(self, msg) -> None:
+        unique_id = msg.topic.split("/")[_UNIQUE_ID_TOPIC_LEVEL]
+        payload = msg.payload
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8", errors="replace")
+        payload = payload.strip().lower()
+
+        if payload == AVAILABILITY_ONLINE:
+            deadline = self._deadlines.get(unique_id)
+            if deadline:
+                deadline.cancel()
+            self._deadlines[unique_id] = self._timer_wheel.schedule(
+                self._timeout, self._async_heartbeat_expired, unique_id
+            )
+            self._async_set_available(unique_id, True)
+        elif payload == AVAILABILITY_OFFLINE:
+            deadline = self._deadlines.pop(unique_id, None)
+            if deadline:
+                deadline.cancel()
+            self._async_set_available(unique_id, False)
+        else:
+            _LOGGER.debug(
+                "Ignoring unknown availability payload %s from %s", payload, unique_id
+            )
+
+    @callback
+    def _async_heartbeat_expired(self, unique_id: str) -> None:
+        self._deadlines.pop(unique_id, None)
+        _LOGGER.debug(
+            "No heartbeat from %s within %ss. Marking it offline",
+            unique_id,
+            self._timeout,
+        )
+        self._async_set_available(unique_id, False)
+
+    @callback
+    def _async_set_available(self, unique_id: str, available: bool) -> None:
+        previous = self.is_available(unique_id)
+        self._available[unique_id] = available
+        if previous == available:
+            return
+
+        _LOGGER.info(
+            "Device %s is %s",
+            unique_id,
+            AVAILABILITY_ONLINE if available else AVAILABILITY_OFFLINE,
+        )
+        self._availability_changed_callback(unique_id, available)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from .const import LOG_SAMPLING_INTERVAL
+
+
+class SampledLogger:
+    """Emits at most one record per key and interval, counting the suppressed ones."""
+
+    def __init__(
+        self, logger: logging.Logger, interval: float = LOG_SAMPLING_INTERVAL
+    ) -> None:
+        self._logger = logger
+        self._interval = interval
+        self._last_logged = {}
+        self._suppressed = {}
+
+    def is_enabled_for(self, level: int) -> bool:
+        return self._logger.isEnabledFor(level)
+
+    def log(self, level: int, key: str, msg: str, *args) -> None:
+        if not self._logger.isEnabledFor(level):
+            return
+
+        now = time.monotonic()
+        last_logged = self._last_logged.get(key)
+        if last_logged is not None and now - last_logged < self._interval:
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            return
+
+        self._last_logged[key] = now
+        suppressed = self._suppressed.pop(key, 0)
+        if suppressed:
+            msg = f"{msg} (%d similar records suppressed)"
+            args = (*args, suppressed)
+
+        self._logger.log(level, msg, *args)
+
+    def debug(self, key: str, msg: str, *args) -> None:
+        self.log(logging.DEBUG, key, msg, *args)
+
+    def forget(self, key: str) -> None:
+        self._last_logged.pop(key, None)
+        self._suppressed.pop(key, None)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Any
+
+LATENCY_BUCKET_BOUNDS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+)
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def increment(self, amount: int = 1) -> None:
+        self.value += amount
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"value": self.value}
+
+
+class Gauge:
+    __slots__ = ("value", "max")
+
+    def __init__(self) -> None:
+        self.value = 0
+        self.max = 0
+
+    def set(self, value: int) -> None:
+        self.value = value
+        if value > self.max:
+            self.max = value
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"value": self.value, "max": self.max}
+
+
+class LatencyHistogram:
+    """Fixed bucket histogram of durations in seconds."""
+
+    __slots__ = ("_buckets", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self._buckets = [0] * (len(LATENCY_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self._buckets[bisect_right(LATENCY_BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, quantile: float) -> float | None:
+        if self.count == 0:
+            return None
+
+        threshold = quantile * self.count
+        seen = 0
+        for index, bucket in enumerate(self._buckets):
+            seen += bucket
+            if seen >= threshold:
+                return (
+                    LATENCY_BUCKET_BOUNDS[index]
+                    if index < len(LATENCY_BUCKET_BOUNDS)
+                    else self.max
+                )
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+            "buckets": dict(
+                zip(
+                    [*map(str, LATENCY_BUCKET_BOUNDS), "+Inf"],
+                    self._buckets,
+                )
+            ),
+        }
+
+
+class MetricsRegistry:
+    """Holds the integration metrics. Callers keep the returned metric objects
+    so recording on the hot path is a single attribute update."""
+
+    _instance = None
+
+    @staticmethod
+    def get_instance() -> MetricsRegistry:
+        if MetricsRegistry._instance is None:
+            MetricsRegistry._instance = MetricsRegistry()
+        return MetricsRegistry._instance
+
+    def __init__(self) -> None:
+        self._metrics = {}
+
+    def counter(self, name: str, label: str | None = None) -> Counter:
+        return self._get_or_create(name, label, Counter)
+
+    def gauge(self, name: str, label: str | None = None) -> Gauge:
+        return self._get_or_create(name, label, Gauge)
+
+    def histogram(self, name: str, label: str | None = None) -> LatencyHistogram:
+        return self._get_or_create(name, label, LatencyHistogram)
+
+    def get(self, name: str, label: str | None = None):
+        return self._metrics.get((name, label))
+
+    def as_dict(self) -> dict[str, Any]:
+        result = {}
+        for (name, label), metric in self._metrics.items():
+            result.setdefault(name, {})[label or ""] = metric.as_dict()
+        return result
+
+    def _get_or_create(self, name: str, label: str | None, factory):
+        key = (name, label)
+        metric = self._metrics.get(key)
+        if metric is None:
+            metric = self._metrics[key] = factory()
+        return metric
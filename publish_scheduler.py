@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import logging
+import asyncio
+
+from collections import OrderedDict, deque
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.components import mqtt
+
+from .metrics import MetricsRegistry
+from .const import (
+    PUBLISH_PRIORITY_ACK,
+    PUBLISH_PRIORITY_INTERACTIVE,
+    PUBLISH_PRIORITY_STATE,
+    PUBLISH_RATE_LIMIT,
+    PUBLISH_BURST,
+    PUBLISH_MAX_IN_FLIGHT,
+    METRIC_PUBLISH_BACKLOG,
+    METRIC_PUBLISH_WAIT_TIME,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_PRIORITY_NAMES = {
+    PUBLISH_PRIORITY_ACK: "ack",
+    PUBLISH_PRIORITY_INTERACTIVE: "interactive",
+    PUBLISH_PRIORITY_STATE: "state",
+}
+
+
+class PublishScheduler:
+    """Orders every outbound MQTT message of the integration.
+
+    Higher priority classes always go first, devices take turns within a class
+    and a token bucket caps the overall message rate.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        rate: float = PUBLISH_RATE_LIMIT,
+        burst: int = PUBLISH_BURST,
+        max_in_flight: int = PUBLISH_MAX_IN_FLIGHT,
+    ) -> None:
+        self._hass = hass
+        self._rate = rate
+        self._burst = burst
+        self._max_in_flight = max_in_flight
+        self._queues = {priority: OrderedDict() for priority in sorted(_PRIORITY_NAMES)}
+        self._backlog = 0
+        self._in_flight = 0
+        self._tokens = float(burst)
+        self._refilled_at = None
+        self._drain_handle = None
+
+        metrics = MetricsRegistry.get_instance()
+        self._backlog_gauge = metrics.gauge(METRIC_PUBLISH_BACKLOG)
+        self._wait_times = {
+            priority: metrics.histogram(METRIC_PUBLISH_WAIT_TIME, name)
+            for priority, name in _PRIORITY_NAMES.items()
+        }
+
+    @callback
+    def publish(
+        self,
+        topic: str,
+        payload: bytes | str,
+        qos: int = 0,
+        priority: int = PUBLISH_PRIORITY_STATE,
+        device: str | None = None,
+        retain: bool = False,
+    ) -> asyncio.Future:
+        future = self._hass.loop.create_future()
+        self._queues[priority].setdefault(device, deque()).append(
+            (topic, payload, qos, retain, future, self._hass.loop.time())
+        )
+        self._backlog += 1
+        self._backlog_gauge.set(self._backlog)
+
+        if not self._drain_handle:
+            self._async_drain()
+        return future
+
+    async def async_publish(
+        self,
+        topic: str,
+        payload: bytes | str,
+        qos: int = 0,
+        priority: int = PUBLISH_PRIORITY_STATE,
+        device: str | None = None,
+        retain: bool = False,
+    ) -> None:
+        await self.publish(topic, payload, qos, priority, device, retain)
+
+    @callback
+    def cancel(self) -> None:
+        if self._drain_handle:
+            self._drain_handle.cancel()
+            self._drain_handle = None
+
+        for devices in self._queues.values():
+            for queue in devices.values():
+                for *_, future, _ in queue:
+                    if not future.done():
+                        future.cancel()
+            devices.clear()
+        self._backlog = 0
+        self._backlog_gauge.set(0)
+
+    @callback
+    def _async_drain(self) -> None:
+        self._drain_handle = None
+        self._refill()
+
+        while self._backlog and self._in_flight < self._max_in_flight:
+            if self._tokens < 1:
+                self._drain_handle = self._hass.loop.call_later(
+                    (1 - self._tokens) / self._rate, self._async_drain
+                )
+                return
+
+            priority, item = self._pop_next()
+            topic, payload, qos, retain, future, queued_at = item
+            if future.done():
+                continue
+
+            self._tokens -= 1
+            self._in_flight += 1
+            self._wait_times[priority].record(self._hass.loop.time() - queued_at)
+            self._hass.async_create_task(
+                self._async_send(topic, payload, qos, retain, future)
+            )
+
+    def _refill(self) -> None:
+        now = self._hass.loop.time()
+        if self._refilled_at is not None:
+            self._tokens = min(
+                self._burst, self._tokens + (now - self._refilled_at) * self._rate
+            )
+        self._refilled_at = now
+
+    def _pop_next(self) -> tuple[int, tuple]:
+        for priority, devices in self._queues.items():
+            if not devices:
+                continue
+
+            # Round robin between devices sharing a priority class
+            device, queue = next(iter(devices.items()))
+            item = queue.popleft()
+            if queue:
+                devices.move_to_end(device)
+            else:
+                del devices[device]
+
+            self._backlog -= 1
+            self._backlog_gauge.set(self._backlog)
+            return priority, item
+
+    async def _async_send(
+        self,
+        topic: str,
+        payload: bytes | str,
+        qos: int,
+        retain: bool,
+        future: asyncio.Future,
+    ) -> None:
+        try:
+            await mqtt.async_publish(self._hass, topic, payload, qos, retain)
+        except Exception as ex:  # pylint: disable=broad-except
+            if not future.done():
+                future.set_exception(ex)
+        else:
+            if not future.done():
+                future.set_result(None)
+        finally:
+            self._in_flight -= 1
+            if not self._drain_handle:
+                self._async_drain()
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
+
+from .metrics import MetricsRegistry
+from .utilities import Utilities
+from .const import (
+    DOMAIN,
+    ENTITY_ID_KEY,
+    CONTROLLER_KEY,
+    DEVICE_DEFERRED_REGISTRATION_KEY,
+    METRIC_STATE_EVENTS_HANDLED,
+    METRIC_FAN_OUT_TIME,
+    METRIC_PUBLISH_QUEUE_DEPTH,
+    METRIC_STATES_PUBLISHED,
+    METRIC_COMMAND_ACK_LATENCY,
+    METRIC_COMMANDS_FAILED,
+    METRIC_MAILBOX_OVERFLOWS,
+    METRIC_STATES_SKIPPED_OFFLINE,
+)
+
+
+def _counter_value(name: str, *labels: str) -> StateType:
+    metrics = MetricsRegistry.get_instance()
+    return sum(
+        metric.value
+        for metric in (metrics.get(name, label) for label in labels)
+        if metric
+    )
+
+
+def _p99_milliseconds(name: str, *labels: str) -> StateType:
+    metrics = MetricsRegistry.get_instance()
+    p99 = None
+    for label in labels:
+        metric = metrics.get(name, label)
+        value = metric.percentile(0.99) if metric else None
+        if value is not None and (p99 is None or value > p99):
+            p99 = value
+    return round(p99 * 1000, 3) if p99 is not None else None
+
+
+@dataclass(frozen=True, kw_only=True)
+class HIDClimateControllerSensorEntityDescription(SensorEntityDescription):
+    value_fn: Callable[[str, list[str]], StateType]
+
+
+SENSOR_DESCRIPTIONS = (
+    HIDClimateControllerSensorEntityDescription(
+        key=METRIC_STATE_EVENTS_HANDLED,
+        name="State events handled",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda controller, climates: _counter_value(
+            METRIC_STATE_EVENTS_HANDLED, *climates
+        ),
+    ),
+    HIDClimateControllerSensorEntityDescription(
+        key=METRIC_FAN_OUT_TIME,
+        name="State fan-out time p99",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda controller, climates: _p99_milliseconds(
+            METRIC_FAN_OUT_TIME, *climates
+        ),
+    ),
+    HIDClimateControllerSensorEntityDescription(
+        key=METRIC_PUBLISH_QUEUE_DEPTH,
+        name="Publish queue depth",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda controller, climates: _counter_value(
+            METRIC_PUBLISH_QUEUE_DEPTH, controller
+        ),
+    ),
+    HIDClimateControllerSensorEntityDescription(
+        key=METRIC_STATES_PUBLISHED,
+        name="States published",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda controller, climates: _counter_value(
+            METRIC_STATES_PUBLISHED, controller
+        ),
+    ),
+    HIDClimateControllerSensorEntityDescription(
+        key=METRIC_COMMAND_ACK_LATENCY,
+        name="Command ACK latency p99",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda controller, climates: _p99_milliseconds(
+            METRIC_COMMAND_ACK_LATENCY, controller
+        ),
+    ),
+    HIDClimateControllerSensorEntityDescription(
+        key=METRIC_COMMANDS_FAILED,
+        name="Failed commands",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda controller, climates: _counter_value(
+            METRIC_COMMANDS_FAILED, controller
+        ),
+    ),
+    HIDClimateControllerSensorEntityDescription(
+        key=METRIC_MAILBOX_OVERFLOWS,
+        name="Mailbox overflows",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda controller, climates: _counter_value(
+            METRIC_MAILBOX_OVERFLOWS, controller
+        ),
+    ),
+    HIDClimateControllerSensorEntityDescription(
+        key=METRIC_STATES_SKIPPED_OFFLINE,
+        name="States skipped while offline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda controller, climates: _counter_value(
+            METRIC_STATES_SKIPPED_OFFLINE, controller
+        ),
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    controller_config = entry.data.get(CONTROLLER_KEY, {})
+    controller_entity_id = controller_config.get(ENTITY_ID_KEY)
+    climate_entity_ids = [
+        climate_config.get(ENTITY_ID_KEY)
+        for climate_config in Utilities.get_climate_configs(entry.data)
+        if climate_config.get(ENTITY_ID_KEY)
+    ]
+    if not controller_entity_id or not climate_entity_ids:
+        return
+
+    if controller_config.get(DEVICE_DEFERRED_REGISTRATION_KEY, True):
+        return
+
+    async_add_entities(
+        HIDClimateControllerMetricSensor(
+            description, controller_entity_id, climate_entity_ids
+        )
+        for description in SENSOR_DESCRIPTIONS
+    )
+
+
+class HIDClimateControllerMetricSensor(SensorEntity):
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    entity_description: HIDClimateControllerSensorEntityDescription
+
+    def __init__(
+        self,
+        description: HIDClimateControllerSensorEntityDescription,
+        controller_entity_id: str,
+        climate_entity_ids: list[str],
+    ) -> None:
+        self.entity_description = description
+        self._controller_entity_id = controller_entity_id
+        self._climate_entity_ids = climate_entity_ids
+        self._attr_unique_id = f"{controller_entity_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, controller_entity_id)}
+        )
+
+    @property
+    def native_value(self) -> StateType:
+        return self.entity_description.value_fn(
+            self._controller_entity_id, self._climate_entity_ids
+        )
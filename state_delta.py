@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+from typing import Any
+
+from .const import (
+    STATE_PAYLOAD_TYPE_KEY,
+    STATE_PAYLOAD_TYPE_FULL,
+    STATE_PAYLOAD_TYPE_DELTA,
+    STATE_PAYLOAD_TYPE_CONFIRM,
+    STATE_SEQUENCE_KEY,
+    STATE_BASE_SEQUENCE_KEY,
+    STATE_VALUE_KEY,
+    STATE_ATTRIBUTES_KEY,
+    STATE_REMOVED_ATTRIBUTES_KEY,
+    STATE_ZONES_KEY,
+    STATE_METADATA_KEYS,
+    TRIGGERING_ENTITY_ULID_KEY,
+    TRIGGERING_ENTITY_ID_KEY,
+)
+
+_MISSING = object()
+# The delta behind a confirm frame, kept until encoding so merges can fall back on it
+_CONFIRMED_DELTA_KEY = "_delta"
+_DELTA_CONTROL_KEYS = (
+    STATE_PAYLOAD_TYPE_KEY,
+    STATE_BASE_SEQUENCE_KEY,
+    STATE_ATTRIBUTES_KEY,
+    STATE_REMOVED_ATTRIBUTES_KEY,
+)
+_TRIGGERING_KEYS = (TRIGGERING_ENTITY_ULID_KEY, TRIGGERING_ENTITY_ID_KEY)
+_ECHO_IGNORED_KEYS = frozenset(
+    (
+        *_DELTA_CONTROL_KEYS,
+        STATE_SEQUENCE_KEY,
+        *STATE_METADATA_KEYS,
+        *_TRIGGERING_KEYS,
+    )
+)
+
+
+def project_state(state: dict[str, Any], fields: frozenset[str]) -> dict[str, Any]:
+    """Keeps the entity state and only the watched attributes of a compressed state."""
+    if not state:
+        return {}
+
+    attributes = state.get(STATE_ATTRIBUTES_KEY, {})
+    return {
+        STATE_VALUE_KEY: state.get(STATE_VALUE_KEY),
+        STATE_ATTRIBUTES_KEY: {
+            field: attributes[field] for field in fields if field in attributes
+        },
+    }
+
+
+def build_full_payload(state: dict[str, Any], sequence: int) -> dict[str, Any]:
+    payload = dict(state)
+    payload[STATE_PAYLOAD_TYPE_KEY] = STATE_PAYLOAD_TYPE_FULL
+    payload[STATE_SEQUENCE_KEY] = sequence
+    return payload
+
+
+def build_delta_payload(
+    previous: dict[str, Any],
+    current: dict[str, Any],
+    base_sequence: int,
+    sequence: int,
+) -> dict[str, Any]:
+    payload = {
+        STATE_PAYLOAD_TYPE_KEY: STATE_PAYLOAD_TYPE_DELTA,
+        STATE_BASE_SEQUENCE_KEY: base_sequence,
+        STATE_SEQUENCE_KEY: sequence,
+    }
+
+    for key, value in current.items():
+        if key != STATE_ATTRIBUTES_KEY and previous.get(key, _MISSING) != value:
+            payload[key] = value
+
+    previous_attributes = previous.get(STATE_ATTRIBUTES_KEY, {})
+    current_attributes = current.get(STATE_ATTRIBUTES_KEY, {})
+
+    changed_attributes = {
+        key: value
+        for key, value in current_attributes.items()
+        if previous_attributes.get(key, _MISSING) != value
+    }
+    if changed_attributes:
+        payload[STATE_ATTRIBUTES_KEY] = changed_attributes
+
+    removed_attributes = [
+        key for key in previous_attributes if key not in current_attributes
+    ]
+    if removed_attributes:
+        payload[STATE_REMOVED_ATTRIBUTES_KEY] = removed_attributes
+
+    return payload
+
+
+def build_confirm_payload(
+    base_sequence: int, sequence: int, delta: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    payload = {
+        STATE_PAYLOAD_TYPE_KEY: STATE_PAYLOAD_TYPE_CONFIRM,
+        STATE_BASE_SEQUENCE_KEY: base_sequence,
+        STATE_SEQUENCE_KEY: sequence,
+    }
+    if delta is not None:
+        payload[_CONFIRMED_DELTA_KEY] = delta
+    return payload
+
+
+def strip_confirmed_deltas(payload: dict[str, Any]) -> dict[str, Any]:
+    """Drops the deltas kept behind confirm frames before a payload goes on the wire."""
+    zones = payload.get(STATE_ZONES_KEY)
+    if zones is not None:
+        return build_zones_payload(
+            {zone: strip_confirmed_deltas(state) for zone, state in zones.items()}
+        )
+
+    if _CONFIRMED_DELTA_KEY not in payload:
+        return payload
+    return {key: value for key, value in payload.items() if key != _CONFIRMED_DELTA_KEY}
+
+
+def is_echo_of(payload: dict[str, Any], expected: dict[str, Any]) -> bool:
+    """Tells whether a delta only sets the values the controller asked for."""
+    if payload.get(STATE_PAYLOAD_TYPE_KEY) != STATE_PAYLOAD_TYPE_DELTA:
+        return False
+    if payload.get(STATE_REMOVED_ATTRIBUTES_KEY):
+        return False
+
+    for key, value in payload.items():
+        if key not in _ECHO_IGNORED_KEYS and expected.get(key, _MISSING) != value:
+            return False
+
+    expected_attributes = expected.get(STATE_ATTRIBUTES_KEY, {})
+    for key, value in payload.get(STATE_ATTRIBUTES_KEY, {}).items():
+        if expected_attributes.get(key, _MISSING) != value:
+            return False
+
+    return True
+
+
+def merge_state_payloads(
+    pending: dict[str, Any] | None, payload: dict[str, Any]
+) -> dict[str, Any]:
+    """Folds a newer payload into a pending one without losing sequence continuity."""
+    if pending is not None:
+        pending_type = pending.get(STATE_PAYLOAD_TYPE_KEY)
+        payload_type = payload.get(STATE_PAYLOAD_TYPE_KEY)
+
+        if payload_type == STATE_PAYLOAD_TYPE_CONFIRM:
+            delta = payload.get(_CONFIRMED_DELTA_KEY)
+            if pending_type == STATE_PAYLOAD_TYPE_CONFIRM:
+                pending_delta = pending.get(_CONFIRMED_DELTA_KEY)
+                return build_confirm_payload(
+                    pending[STATE_BASE_SEQUENCE_KEY],
+                    payload[STATE_SEQUENCE_KEY],
+                    (
+                        merge_state_payloads(pending_delta, delta)
+                        if pending_delta is not None and delta is not None
+                        else None
+                    ),
+                )
+            if delta is None:
+                merged = dict(pending)
+                merged[STATE_SEQUENCE_KEY] = payload[STATE_SEQUENCE_KEY]
+                return merged
+            # The pending payload would overwrite the confirmed values with older ones
+            return merge_state_payloads(pending, delta)
+
+        if pending_type == STATE_PAYLOAD_TYPE_CONFIRM:
+            if payload_type != STATE_PAYLOAD_TYPE_DELTA:
+                return payload
+            pending_delta = pending.get(_CONFIRMED_DELTA_KEY)
+            if pending_delta is not None:
+                return merge_state_payloads(pending_delta, payload)
+            merged = dict(payload)
+            merged[STATE_BASE_SEQUENCE_KEY] = pending[STATE_BASE_SEQUENCE_KEY]
+            return merged
+
+    if (
+        pending is None
+        or payload.get(STATE_PAYLOAD_TYPE_KEY) != STATE_PAYLOAD_TYPE_DELTA
+    ):
+        return payload
+
+    merged = dict(pending)
+    # The triggering controller describes the newest change only
+    for key in _TRIGGERING_KEYS:
+        merged.pop(key, None)
+    for key, value in payload.items():
+        if key not in _DELTA_CONTROL_KEYS:
+            merged[key] = value
+
+    removed = payload.get(STATE_REMOVED_ATTRIBUTES_KEY, [])
+    attributes = {
+        **pending.get(STATE_ATTRIBUTES_KEY, {}),
+        **payload.get(STATE_ATTRIBUTES_KEY, {}),
+    }
+    for key in removed:
+        attributes.pop(key, None)
+
+    is_full = pending.get(STATE_PAYLOAD_TYPE_KEY) == STATE_PAYLOAD_TYPE_FULL
+    if attributes or is_full:
+        merged[STATE_ATTRIBUTES_KEY] = attributes
+    else:
+        merged.pop(STATE_ATTRIBUTES_KEY, None)
+
+    merged.pop(STATE_REMOVED_ATTRIBUTES_KEY, None)
+    if not is_full:
+        pending_removed = [
+            key
+            for key in pending.get(STATE_REMOVED_ATTRIBUTES_KEY, [])
+            if key not in attributes and key not in removed
+        ]
+        if pending_removed or removed:
+            merged[STATE_REMOVED_ATTRIBUTES_KEY] = pending_removed + list(removed)
+
+    return merged
+
+
+def build_zones_payload(zone_payloads: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    return {STATE_ZONES_KEY: dict(zone_payloads)}
+
+
+def merge_zones_payloads(
+    pending: dict[str, Any] | None, payload: dict[str, Any]
+) -> dict[str, Any]:
+    """Folds a newer multiplexed payload into a pending one, zone by zone."""
+    if pending is None:
+        return payload
+
+    zones = dict(pending[STATE_ZONES_KEY])
+    for zone, zone_payload in payload[STATE_ZONES_KEY].items():
+        zones[zone] = merge_state_payloads(zones.get(zone), zone_payload)
+
+    return {STATE_ZONES_KEY: zones}
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import logging
+
+from typing import Any, Callable
+
+from homeassistant.core import HomeAssistant, callback
+
+from .metrics import MetricsRegistry
+from .publish_scheduler import PublishScheduler
+from .timer_wheel import TimerWheel
+from .state_delta import strip_confirmed_deltas
+from .wire_format import JsonWireFormat, MsgpackWireFormat, get_wire_format
+from .const import (
+    STATE_PUBLISH_MIN_INTERVAL,
+    STATE_PUBLISH_MAX_LATENCY,
+    STATE_PUBLISH_QOS,
+    STATE_PAYLOAD_TYPE_KEY,
+    STATE_PAYLOAD_TYPE_CONFIRM,
+    STATE_ZONES_KEY,
+    TRIGGERING_ENTITY_ID_KEY,
+    PUBLISH_PRIORITY_INTERACTIVE,
+    PUBLISH_PRIORITY_STATE,
+    METRIC_PUBLISH_QUEUE_DEPTH,
+    METRIC_STATES_PUBLISHED,
+    METRIC_STATES_COALESCED,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _get_publish_priority(state: dict[str, Any]) -> int:
+    # States caused by a controller command are echoes somebody is waiting for
+    zones = state.get(STATE_ZONES_KEY)
+    for payload in zones.values() if zones is not None else (state,):
+        if payload.get(TRIGGERING_ENTITY_ID_KEY) or (
+            payload.get(STATE_PAYLOAD_TYPE_KEY) == STATE_PAYLOAD_TYPE_CONFIRM
+        ):
+            return PUBLISH_PRIORITY_INTERACTIVE
+    return PUBLISH_PRIORITY_STATE
+
+
+class CoalescingStatePublisher:
+    """Publishes the latest state at most once per interval, coalescing superseded ones."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        topic: str,
+        publish_scheduler: PublishScheduler,
+        min_interval: float = STATE_PUBLISH_MIN_INTERVAL,
+        max_latency: float | None = STATE_PUBLISH_MAX_LATENCY,
+        qos: int = STATE_PUBLISH_QOS,
+        wire_format: JsonWireFormat | MsgpackWireFormat | None = None,
+        merge: (
+            Callable[[dict[str, Any] | None, dict[str, Any]], dict[str, Any]] | None
+        ) = None,
+        metrics_label: str | None = None,
+    ) -> None:
+        self._hass = hass
+        self._topic = topic
+        self._publish_scheduler = publish_scheduler
+        self._min_interval = min_interval
+        self._max_latency = max_latency
+        self._qos = qos
+        self._wire_format = wire_format or get_wire_format(None)
+        self._merge = merge
+        self._pending = None
+        self._first_pending_at = None
+        self._last_published_at = None
+        self._flush_handle = None
+        self._pending_count = 0
+
+        metrics_label = metrics_label or topic
+        self._device = metrics_label
+        self._timer_wheel = TimerWheel.get_instance()
+        metrics = MetricsRegistry.get_instance()
+        self._queue_depth = metrics.gauge(METRIC_PUBLISH_QUEUE_DEPTH, metrics_label)
+        self._states_published = metrics.counter(METRIC_STATES_PUBLISHED, metrics_label)
+        self._states_coalesced = metrics.counter(METRIC_STATES_COALESCED, metrics_label)
+
+    @property
+    def has_pending(self) -> bool:
+        return self._pending is not None
+
+    @callback
+    def publish(self, state: dict[str, Any]) -> None:
+        now = self._hass.loop.time()
+
+        if self._pending is None and (
+            self._last_published_at is None
+            or now - self._last_published_at >= self._min_interval
+        ):
+            self._async_publish_now(state, now)
+            return
+
+        if self._pending is not None:
+            self._states_coalesced.increment()
+        self._pending = self._merge(self._pending, state) if self._merge else state
+        self._pending_count += 1
+        self._queue_depth.set(self._pending_count)
+        if self._first_pending_at is None:
+            self._first_pending_at = now
+
+        flush_at = now + self._min_interval
+        if self._max_latency is not None:
+            flush_at = min(flush_at, self._first_pending_at + self._max_latency)
+        flush_at = max(flush_at, self._last_published_at + self._min_interval)
+
+        if self._flush_handle:
+            self._flush_handle.cancel()
+        self._flush_handle = self._timer_wheel.schedule_at(flush_at, self._async_flush)
+
+    @callback
+    def cancel(self) -> None:
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        self._pending = None
+        self._first_pending_at = None
+        self._pending_count = 0
+        self._queue_depth.set(0)
+
+    @callback
+    def _async_flush(self) -> None:
+        self._flush_handle = None
+
+        state = self._pending
+        self._pending = None
+        self._first_pending_at = None
+        self._pending_count = 0
+        self._queue_depth.set(0)
+        if state is None:
+            return
+
+        self._async_publish_now(state, self._hass.loop.time())
+
+    @callback
+    def _async_publish_now(self, state: dict[str, Any], now: float) -> None:
+        self._last_published_at = now
+        self._states_published.increment()
+        self._hass.async_create_task(self._async_publish(state))
+
+    async def _async_publish(self, state: dict[str, Any]) -> None:
+        try:
+            await self._publish_scheduler.async_publish(
+                self._topic,
+                self._wire_format.encode(strip_confirmed_deltas(state)),
+                self._qos,
+                priority=_get_publish_priority(state),
+                device=self._device,
+            )
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.error("Failed to publish state on topic %s: %s", self._topic, ex)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    STATE_STORE_KEY,
+    STATE_STORE_VERSION,
+    STATE_STORE_SAVE_DELAY,
+    STATE_STORE_STATE_KEY,
+    STATE_STORE_SEQUENCE_KEY,
+)
+
+
+class LastKnownStateStore:
+    """Persists the last published state and sequence number per climate entity."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._store = Store(hass, STATE_STORE_VERSION, STATE_STORE_KEY)
+        self._data = None
+        self._loaded = False
+        self._load_task = None
+
+    async def async_get(self, entity_id: str) -> dict[str, Any] | None:
+        await self._async_load()
+        return self._data.get(entity_id)
+
+    @callback
+    def async_set(self, entity_id: str, state: dict[str, Any], sequence: int) -> None:
+        if self._data is None:
+            self._data = {}
+
+        self._data[entity_id] = {
+            STATE_STORE_STATE_KEY: state,
+            STATE_STORE_SEQUENCE_KEY: sequence,
+        }
+        self._store.async_delay_save(self._data_to_save, STATE_STORE_SAVE_DELAY)
+
+    async def _async_load(self) -> None:
+        if self._loaded:
+            return
+
+        if self._load_task is None:
+            self._load_task = self._hass.async_create_task(self._store.async_load())
+
+        data = await self._load_task
+        if not self._loaded:
+            self._data = {**(data or {}), **(self._data or {})}
+            self._loaded = True
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return self._data or {}
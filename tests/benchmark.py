@@ -0,0 +1,357 @@
+"""Offline benchmarks for the integration hot paths.
+
+Runs against the stand-ins from harness.py, so no Home Assistant instance or
+broker is needed:
+
+    python tests/benchmark.py [--quick] > bench_output.txt
+
+Every scenario prints its throughput, the p50/p99 latency of one unit of work
+and the memory blocks still allocated per unit of work once it finished.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import sys
+import time
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import harness  # noqa: E402
+
+harness.install()
+
+ClimateService = harness.load("climate_service").ClimateService
+ClimateCommands = harness.load("climate_commands").ClimateCommands
+ClimateBridge = harness.load("climate_bridge").ClimateBridge
+DeviceController = harness.load("device_controller").DeviceController
+PublishScheduler = harness.load("publish_scheduler").PublishScheduler
+ClimateCommandScheduler = harness.load("command_scheduler").ClimateCommandScheduler
+MqttCommandRouter = harness.load("command_router").MqttCommandRouter
+AsyncRegistry = harness.load("async_registry").AsyncRegistry
+DiscoveryGate = harness.load("discovery_gate").DiscoveryGate
+validators = harness.load("validators")
+integration = harness.load("integration")
+
+_HEADER = (
+    f"{'scenario':<44} {'units':>7} {'units/s':>11} {'p50 ms':>9} "
+    f"{'p99 ms':>9} {'blocks/unit':>12}"
+)
+
+
+class Measurement:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.latencies = []
+        self._started_at = None
+        self._elapsed = None
+        self._blocks = None
+
+    def __enter__(self) -> Measurement:
+        gc.collect()
+        self._blocks = sys.getallocatedblocks()
+        self._started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._elapsed = time.perf_counter() - self._started_at
+        gc.collect()
+        # Every recorded latency is a float block of its own, leave those out
+        self._blocks = sys.getallocatedblocks() - self._blocks - len(self.latencies)
+
+    def report(self, units: int | None = None) -> None:
+        units = units or len(self.latencies)
+        latencies = sorted(self.latencies)
+
+        def percentile(quantile: float) -> str:
+            if not latencies:
+                return "-"
+            index = min(len(latencies) - 1, int(quantile * len(latencies)))
+            return f"{latencies[index] * 1000:.4f}"
+
+        print(
+            f"{self.name:<44} {units:>7} {units / self._elapsed:>11.0f} "
+            f"{percentile(0.5):>9} {percentile(0.99):>9} "
+            f"{self._blocks / units:>12.2f}",
+            flush=True,
+        )
+
+
+def _climate_ids(count: int, prefix: str = "climate.zone") -> list[str]:
+    return [f"{prefix}_{index}" for index in range(count)]
+
+
+async def _build_bridges(
+    hass: harness.FakeHomeAssistant,
+    bridges: int,
+    controllers: int,
+    ids,
+) -> tuple[list[ClimateBridge], list[DeviceController]]:
+    climate = harness.FakeClimatePlatform(hass)
+    climate_commands = ClimateCommands(ClimateService(hass))
+    publish_scheduler = PublishScheduler(hass)
+    climate_bridges = []
+    device_controllers = []
+
+    for climate_id in _climate_ids(bridges):
+        climate.add(climate_id)
+        bridge = ClimateBridge(hass, climate_commands, None, {"entity_id": climate_id})
+        for _ in range(controllers):
+            controller = DeviceController(
+                hass,
+                {"entity_id": next(ids), "device": {}},
+                publish_scheduler,
+                zones=[climate_id],
+            )
+            await controller.initialize()
+            bridge.register_controller(controller)
+            device_controllers.append(controller)
+        climate_bridges.append(bridge)
+
+    return climate_bridges, device_controllers
+
+
+async def state_storm(
+    hass: harness.FakeHomeAssistant, bridges: int, controllers: int, events: int
+) -> None:
+    climate_bridges, device_controllers = await _build_bridges(
+        hass, bridges, controllers, harness.controller_ids()
+    )
+    by_entity_id = {bridge.entity_id: bridge for bridge in climate_bridges}
+
+    measurement = Measurement(f"state storm {bridges} bridges x {controllers} ctrl")
+
+    def dispatch(event) -> None:
+        started_at = time.perf_counter()
+        by_entity_id[event.data["entity_id"]].async_handle_state_changed(event)
+        measurement.latencies.append(time.perf_counter() - started_at)
+
+    hass.bus.async_listen("state_changed", dispatch)
+
+    with measurement:
+        for index in range(events):
+            bridge = climate_bridges[index % bridges]
+            hass.states.async_set(
+                bridge.entity_id,
+                "heat",
+                {"temperature": 18 + index % 8, "current_temperature": 19.5},
+            )
+            # Let the controller mailboxes drain like the event loop would
+            await asyncio.sleep(0)
+    measurement.report()
+
+    for controller in device_controllers:
+        await controller.destroy()
+
+
+async def attribution_scaling(
+    hass: harness.FakeHomeAssistant, controllers: int, lookups: int
+) -> None:
+    (bridge,), device_controllers = await _build_bridges(
+        hass, 1, controllers, harness.controller_ids()
+    )
+    context = harness.Context(parent_id=device_controllers[-1].entity_id_ulid)
+    event = harness.Event("state_changed", {}, context=context)
+
+    measurement = Measurement(f"triggering lookup, {controllers} ctrl")
+    with measurement:
+        for _ in range(lookups):
+            started_at = time.perf_counter()
+            bridge._add_triggering_data({}, event)
+            measurement.latencies.append(time.perf_counter() - started_at)
+    measurement.report()
+
+    for controller in device_controllers:
+        await controller.destroy()
+
+
+async def command_burst(
+    hass: harness.FakeHomeAssistant, devices: int, commands: int
+) -> None:
+    ids = harness.controller_ids()
+    climate_bridges, device_controllers = await _build_bridges(hass, devices, 1, ids)
+    # Measure the integration, not the broker rate limit
+    publish_scheduler = PublishScheduler(hass, rate=1e9, burst=10**9)
+    command_scheduler = ClimateCommandScheduler(
+        hass, ClimateCommands(ClimateService(hass)), merge_window=0
+    )
+    controllers_by_id = {
+        controller.entity_id: controller for controller in device_controllers
+    }
+    bridges_by_id = {
+        controller.entity_id: {bridge.entity_id: bridge}
+        for controller, bridge in zip(device_controllers, climate_bridges)
+    }
+    router = MqttCommandRouter(
+        hass,
+        publish_scheduler,
+        command_scheduler,
+        controllers_by_id.get,
+        bridges_by_id.get,
+    )
+    await router.start()
+
+    sent_at = {}
+    acked = asyncio.Event()
+    measurement = Measurement(f"command burst {devices} devices x {commands}")
+
+    def handle_ack(msg) -> None:
+        unique_id = msg.topic.split("/")[2]
+        message_id = json.loads(msg.payload)["message_id"]
+        started_at = sent_at.pop((unique_id, message_id))
+        measurement.latencies.append(time.perf_counter() - started_at)
+        if not sent_at:
+            acked.set()
+
+    hass.mqtt.subscribe(
+        "homeassistant/hid_climate_controller/+/services/+/ack", handle_ack, 1, None
+    )
+
+    with measurement:
+        for message_id in range(commands):
+            for unique_id in controllers_by_id:
+                sent_at[(unique_id, message_id)] = time.perf_counter()
+                hass.mqtt.publish(
+                    f"homeassistant/hid_climate_controller/{unique_id}"
+                    "/services/set_temperature",
+                    json.dumps(
+                        {"message_id": message_id, "temperature": 18 + message_id % 8}
+                    ),
+                )
+        await acked.wait()
+    measurement.report()
+
+    await router.stop()
+    for controller in device_controllers:
+        await controller.destroy()
+
+
+async def discovery_flood(hass: harness.FakeHomeAssistant, payloads: int) -> None:
+    ids = harness.controller_ids()
+    announcements = [harness.discovery_payload(next(ids)) for _ in range(payloads)]
+
+    for name, validate in (
+        ("discovery validation, fast path", validators.validate_discovery_info),
+        ("discovery validation, schema", validators.DISCOVERY_INFO_SCHEMA),
+    ):
+        measurement = Measurement(name)
+        with measurement:
+            for announcement in announcements:
+                started_at = time.perf_counter()
+                validate(announcement)
+                measurement.latencies.append(time.perf_counter() - started_at)
+        measurement.report()
+
+    gate = DiscoveryGate()
+    messages = [
+        harness.ReceiveMessage(
+            f"homeassistant/hid_climate_controller/{announcement['unique_id']}/config",
+            json.dumps(announcement),
+            1,
+            True,
+            "homeassistant/hid_climate_controller/+/config",
+        )
+        for announcement in announcements
+    ]
+    for message in messages:
+        gate.async_begin(message)
+        gate.async_end(message)
+
+    measurement = Measurement("discovery re-announcements dropped")
+    with measurement:
+        for message in messages:
+            started_at = time.perf_counter()
+            gate.async_begin(message)
+            measurement.latencies.append(time.perf_counter() - started_at)
+    measurement.report()
+
+
+async def registry_stress(hass: harness.FakeHomeAssistant, keys: int) -> None:
+    registry = AsyncRegistry()
+
+    async def construct() -> object:
+        await asyncio.sleep(0)
+        return object()
+
+    async def register(key: str) -> None:
+        started_at = time.perf_counter()
+        await registry.async_setdefault_with_func_construct(key, construct)
+        measurement.latencies.append(time.perf_counter() - started_at)
+
+    measurement = Measurement(f"registry stress, {keys} keys x 2 callers")
+    with measurement:
+        await asyncio.gather(
+            *(register(f"key_{index % keys}") for index in range(keys * 2))
+        )
+    measurement.report()
+
+
+async def batched_startup(hass: harness.FakeHomeAssistant, entries: int) -> None:
+    integration.HIDClimateControllerIntegration._instance = None
+    instance = integration.HIDClimateControllerIntegration.get_instance()
+    await instance.init(hass)
+
+    climate = harness.FakeClimatePlatform(hass)
+    ids = harness.controller_ids(f"HW-THID-{entries:04d}")
+    config_entries = []
+    for index, climate_id in enumerate(_climate_ids(entries, "climate.startup")):
+        climate.add(climate_id)
+        controller_id = next(ids)
+        config_entries.append(
+            harness.FakeConfigEntry(
+                entry_id=f"entry_{entries}_{index}",
+                unique_id=controller_id,
+                data={
+                    "controller": {
+                        "entity_id": controller_id,
+                        "friendly_name": f"Panel {index}",
+                        "device": {},
+                    },
+                    "climate": {"entity_id": climate_id},
+                },
+            )
+        )
+
+    measurement = Measurement(f"startup, time to {entries} devices ready")
+    with measurement:
+        started_at = time.perf_counter()
+        await instance._async_register_device_batch(config_entries)
+        measurement.latencies.append(time.perf_counter() - started_at)
+    measurement.report(entries)
+
+    for entry in config_entries:
+        await instance._async_unregister_device(entry)
+
+
+def main(quick: bool) -> None:
+    scale = 10 if quick else 1
+    scenarios = [
+        *(
+            (state_storm, bridges, controllers, 20000 // scale)
+            for bridges, controllers in ((10, 1), (100, 1), (100, 10), (1000, 1))
+        ),
+        *(
+            (attribution_scaling, controllers, 100000 // scale)
+            for controllers in (1, 10, 100, 1000)
+        ),
+        (command_burst, 100, 50 // scale),
+        (discovery_flood, 20000 // scale),
+        (registry_stress, 5000 // scale),
+        *((batched_startup, entries) for entries in sorted({10, 100, 1000 // scale})),
+    ]
+
+    print(_HEADER)
+    for scenario, *args in scenarios:
+        # A fresh hass per scenario, so listeners and timers do not leak between them
+        harness.run(scenario, *args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="run a tenth of the work")
+    main(parser.parse_args().quick)
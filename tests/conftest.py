@@ -0,0 +1,3 @@
+import harness
+
+harness.install()
@@ -0,0 +1,554 @@
+"""Offline stand-ins for Home Assistant and the MQTT broker.
+
+install() registers a minimal ``homeassistant`` package in sys.modules and loads
+the integration as ``hid_climate_controller`` without executing its __init__,
+so its modules can be driven without Home Assistant or a network. Only the
+parts of the Home Assistant API used by the integration are provided.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import itertools
+import json
+import re
+import sys
+import time
+import types
+import uuid
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "hid_climate_controller"
+
+EVENT_STATE_CHANGED = "state_changed"
+STATE_UNAVAILABLE = "unavailable"
+STATE_UNKNOWN = "unknown"
+
+
+def callback(func: Callable) -> Callable:
+    func._hass_callback = True
+    return func
+
+
+class Context:
+    __slots__ = ("id", "parent_id", "user_id")
+
+    def __init__(
+        self, user_id: str | None = None, parent_id: str | None = None, id=None
+    ) -> None:
+        self.id = id or uuid.uuid4().hex
+        self.user_id = user_id
+        self.parent_id = parent_id
+
+
+class Event:
+    __slots__ = ("event_type", "data", "context", "time_fired")
+
+    def __init__(
+        self,
+        event_type: str,
+        data: dict[str, Any] | None = None,
+        origin: Any = None,
+        time_fired: float | None = None,
+        context: Context | None = None,
+    ) -> None:
+        self.event_type = event_type
+        self.data = data or {}
+        self.context = context or Context()
+        self.time_fired = time_fired or time.time()
+
+
+class State:
+    def __init__(
+        self,
+        entity_id: str,
+        state: str,
+        attributes: dict[str, Any] | None = None,
+        last_changed: float | None = None,
+        last_updated: float | None = None,
+        context: Context | None = None,
+    ) -> None:
+        now = time.time()
+        self.entity_id = entity_id
+        self.state = state
+        self.attributes = dict(attributes or {})
+        self.last_changed = last_changed or now
+        self.last_updated = last_updated or now
+        self.context = context or Context()
+
+    def as_compressed_state(self) -> dict[str, Any]:
+        context = self.context
+        compressed = {
+            "s": self.state,
+            "a": self.attributes,
+            "c": (
+                context.id
+                if context.parent_id is None and context.user_id is None
+                else {"id": context.id, "parent_id": context.parent_id}
+            ),
+            "lc": self.last_changed,
+        }
+        if self.last_updated != self.last_changed:
+            compressed["lu"] = self.last_updated
+        return compressed
+
+
+class EventBus:
+    def __init__(self, hass: FakeHomeAssistant) -> None:
+        self._hass = hass
+        self._listeners = {}
+
+    def async_listen(self, event_type: str, listener: Callable) -> Callable:
+        listeners = self._listeners.setdefault(event_type, [])
+        listeners.append(listener)
+        return lambda: listeners.remove(listener)
+
+    def async_fire(
+        self,
+        event_type: str,
+        event_data: dict[str, Any] | None = None,
+        context: Context | None = None,
+    ) -> None:
+        event = Event(event_type, event_data, context=context)
+        for listener in list(self._listeners.get(event_type, ())):
+            self._hass.async_run_job(listener, event)
+
+
+class StateMachine:
+    def __init__(self, hass: FakeHomeAssistant) -> None:
+        self._hass = hass
+        self._states = {}
+
+    def get(self, entity_id: str) -> State | None:
+        return self._states.get(entity_id)
+
+    def async_set(
+        self,
+        entity_id: str,
+        new_state: str,
+        attributes: dict[str, Any] | None = None,
+        context: Context | None = None,
+    ) -> State:
+        old_state = self._states.get(entity_id)
+        now = time.time()
+        last_changed = (
+            old_state.last_changed
+            if old_state is not None and old_state.state == new_state
+            else now
+        )
+        state = State(entity_id, new_state, attributes, last_changed, now, context)
+        self._states[entity_id] = state
+        self._hass.bus.async_fire(
+            EVENT_STATE_CHANGED,
+            {"entity_id": entity_id, "old_state": old_state, "new_state": state},
+            context=state.context,
+        )
+        return state
+
+
+@dataclass
+class ServiceCall:
+    domain: str
+    service: str
+    data: dict[str, Any]
+    context: Context
+
+
+class ServiceRegistry:
+    def __init__(self) -> None:
+        self._handlers = {}
+        self.calls: list[ServiceCall] = []
+
+    def async_register(self, domain: str, service: str, handler: Callable) -> None:
+        self._handlers[(domain, service)] = handler
+
+    async def async_call(
+        self,
+        domain: str,
+        service: str,
+        service_data: dict[str, Any] | None = None,
+        blocking: bool = False,
+        context: Context | None = None,
+        target: dict[str, Any] | None = None,
+        return_response: bool = False,
+    ) -> Any:
+        handler = self._handlers.get((domain, service))
+        if handler is None:
+            raise ValueError(f"Service {domain}.{service} not found")
+
+        call = ServiceCall(
+            domain, service, {**(service_data or {}), **(target or {})}, context
+        )
+        self.calls.append(call)
+        result = handler(call)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+
+class FakeHomeAssistant:
+    """The parts of HomeAssistant the integration touches, bound to the running loop."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.data = {}
+        self.bus = EventBus(self)
+        self.states = StateMachine(self)
+        self.services = ServiceRegistry()
+        self.mqtt = InMemoryBroker(self)
+        self._tasks = set()
+        self._background_tasks = set()
+
+    def async_create_task(self, coro, name: str | None = None) -> asyncio.Task:
+        task = self.loop.create_task(coro, name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def async_create_background_task(self, coro, name: str) -> asyncio.Task:
+        task = self.loop.create_task(coro, name=name)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    def async_run_job(self, target: Callable, *args: Any) -> None:
+        if asyncio.iscoroutinefunction(target):
+            self.async_create_task(target(*args))
+        else:
+            target(*args)
+
+    async def async_block_till_done(self) -> None:
+        # Foreground tasks may spawn further tasks, keep going until none are left
+        while True:
+            await asyncio.sleep(0)
+            tasks = [task for task in self._tasks if not task.done()]
+            if not tasks:
+                return
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def async_stop(self) -> None:
+        tasks = [*self._tasks, *self._background_tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@dataclass
+class ReceiveMessage:
+    topic: str
+    payload: bytes | str
+    qos: int
+    retain: bool
+    subscribed_topic: str
+    timestamp: float = field(default_factory=time.monotonic)
+
+
+def _topic_pattern(topic_filter: str) -> re.Pattern:
+    levels = []
+    for level in topic_filter.split("/"):
+        if level == "+":
+            levels.append("[^/]+")
+        elif level == "#":
+            levels.append(".*")
+        else:
+            levels.append(re.escape(level))
+    return re.compile("/".join(levels) + "$")
+
+
+class InMemoryBroker:
+    """MQTT stand-in delivering publishes to matching subscriptions on the next loop turn."""
+
+    def __init__(self, hass: FakeHomeAssistant) -> None:
+        self._hass = hass
+        self._subscriptions = []
+        self._retained = {}
+        self.published: list[ReceiveMessage] = []
+
+    def subscribe(
+        self, topic_filter: str, msg_callback: Callable, qos: int, encoding: str | None
+    ) -> Callable:
+        subscription = (
+            _topic_pattern(topic_filter),
+            topic_filter,
+            msg_callback,
+            encoding,
+        )
+        self._subscriptions.append(subscription)
+        for topic, message in list(self._retained.items()):
+            if subscription[0].match(topic):
+                self._deliver(subscription, message)
+        return lambda: self._subscriptions.remove(subscription)
+
+    def publish(
+        self, topic: str, payload: bytes | str, qos: int = 0, retain: bool = False
+    ) -> None:
+        if isinstance(payload, str):
+            payload = payload.encode()
+        message = ReceiveMessage(topic, payload, qos, retain, topic)
+        self.published.append(message)
+        if retain:
+            self._retained[topic] = message
+
+        for subscription in list(self._subscriptions):
+            if subscription[0].match(topic):
+                self._hass.loop.call_soon(self._deliver, subscription, message)
+
+    def messages(self, topic_filter: str) -> list[ReceiveMessage]:
+        pattern = _topic_pattern(topic_filter)
+        return [message for message in self.published if pattern.match(message.topic)]
+
+    def _deliver(self, subscription: tuple, message: ReceiveMessage) -> None:
+        _, topic_filter, msg_callback, encoding = subscription
+        payload = message.payload
+        if encoding is not None:
+            payload = payload.decode(encoding)
+        self._hass.async_run_job(
+            msg_callback,
+            ReceiveMessage(
+                message.topic, payload, message.qos, message.retain, topic_filter
+            ),
+        )
+
+
+class FakeClimatePlatform:
+    """Climate entities whose services apply the requested values to their state."""
+
+    def __init__(self, hass: FakeHomeAssistant) -> None:
+        self._hass = hass
+        self.failing_services = set()
+        for service in (
+            "turn_on",
+            "turn_off",
+            "set_temperature",
+            "set_hvac_mode",
+            "set_swing_mode",
+            "set_preset_mode",
+            "set_humidity",
+            "set_fan_mode",
+            "set_aux_heat",
+        ):
+            hass.services.async_register("climate", service, self._async_handle)
+
+    def add(self, entity_id: str, hvac_mode: str = "heat", **attributes: Any) -> State:
+        return self._hass.states.async_set(
+            entity_id,
+            hvac_mode,
+            {"temperature": 20.0, "current_temperature": 19.5, **attributes},
+        )
+
+    async def _async_handle(self, call: ServiceCall) -> None:
+        if call.service in self.failing_services:
+            raise ValueError(f"{call.service} failed")
+
+        data = dict(call.data)
+        entity_id = data.pop("entity_id")
+        state = self._hass.states.get(entity_id)
+        hvac_mode = state.state
+        attributes = dict(state.attributes)
+
+        if call.service == "turn_on":
+            hvac_mode = "heat" if hvac_mode == "off" else hvac_mode
+        elif call.service == "turn_off":
+            hvac_mode = "off"
+        hvac_mode = data.pop("hvac_mode", hvac_mode)
+        attributes.update(data)
+
+        self._hass.states.async_set(entity_id, hvac_mode, attributes, call.context)
+
+
+class FakeStore:
+    def __init__(self, hass: FakeHomeAssistant, version: int, key: str, **kwargs):
+        self.data = None
+
+    async def async_load(self) -> Any:
+        return self.data
+
+    async def async_save(self, data: Any) -> None:
+        self.data = data
+
+    def async_delay_save(self, data_func: Callable[[], Any], delay: float = 0) -> None:
+        self.data = data_func()
+
+
+class FakeDeviceRegistry:
+    def __init__(self) -> None:
+        self.devices = {}
+
+    def async_get_or_create(self, **kwargs: Any) -> dict[str, Any]:
+        key = frozenset(kwargs["identifiers"])
+        return self.devices.setdefault(key, kwargs)
+
+
+@dataclass
+class FakeConfigEntry:
+    entry_id: str
+    data: dict[str, Any]
+    unique_id: str | None = None
+
+
+def _json_encoder_default(obj: Any) -> Any:
+    if isinstance(obj, (set, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _install_homeassistant() -> None:
+    import voluptuous as vol
+
+    def module(name: str, **attributes: Any) -> types.ModuleType:
+        mod = sys.modules.get(name)
+        if mod is None:
+            mod = sys.modules[name] = types.ModuleType(name)
+        mod.__dict__.update(attributes)
+        parent, _, child = name.rpartition(".")
+        if parent:
+            setattr(sys.modules[parent], child, mod)
+        return mod
+
+    def string(value: Any) -> str:
+        if value is None:
+            raise vol.Invalid("string value is None")
+        if isinstance(value, (list, dict)):
+            raise vol.Invalid("value should be a string")
+        return str(value)
+
+    def ensure_list(value: Any) -> list:
+        if value is None:
+            return []
+        return value if isinstance(value, list) else [value]
+
+    def device_registry_async_get(hass: FakeHomeAssistant) -> FakeDeviceRegistry:
+        return hass.data.setdefault("device_registry", FakeDeviceRegistry())
+
+    def async_dispatcher_send(hass: FakeHomeAssistant, signal: str, *args) -> None:
+        for target in list(hass.data.get("dispatcher", {}).get(signal, ())):
+            hass.async_run_job(target, *args)
+
+    def async_dispatcher_connect(
+        hass: FakeHomeAssistant, signal: str, target: Callable
+    ) -> Callable:
+        targets = hass.data.setdefault("dispatcher", {}).setdefault(signal, [])
+        targets.append(target)
+        return lambda: targets.remove(target)
+
+    async def async_subscribe(
+        hass, topic, msg_callback, qos=0, encoding="utf-8"
+    ) -> Callable:
+        return hass.mqtt.subscribe(topic, msg_callback, qos, encoding)
+
+    async def async_publish(hass, topic, payload, qos=0, retain=False) -> None:
+        hass.mqtt.publish(topic, payload, qos, retain)
+
+    async def async_wait_for_mqtt_client(hass) -> bool:
+        return True
+
+    class Platform:
+        BINARY_SENSOR = "binary_sensor"
+        SENSOR = "sensor"
+
+    module("homeassistant")
+    module(
+        "homeassistant.core",
+        HomeAssistant=FakeHomeAssistant,
+        Event=Event,
+        State=State,
+        Context=Context,
+        ServiceResponse=Any,
+        callback=callback,
+    )
+    module(
+        "homeassistant.const",
+        EVENT_STATE_CHANGED=EVENT_STATE_CHANGED,
+        STATE_UNAVAILABLE=STATE_UNAVAILABLE,
+        STATE_UNKNOWN=STATE_UNKNOWN,
+        Platform=Platform,
+    )
+    module("homeassistant.config_entries", ConfigEntry=FakeConfigEntry)
+    module("homeassistant.components")
+    module(
+        "homeassistant.components.mqtt",
+        async_subscribe=async_subscribe,
+        async_publish=async_publish,
+        async_wait_for_mqtt_client=async_wait_for_mqtt_client,
+    )
+    module("homeassistant.helpers")
+    module(
+        "homeassistant.helpers.config_validation",
+        string=string,
+        ensure_list=ensure_list,
+    )
+    module(
+        "homeassistant.helpers.json",
+        json_dumps=lambda data: json.dumps(data, default=_json_encoder_default),
+        json_encoder_default=_json_encoder_default,
+    )
+    module("homeassistant.helpers.storage", Store=FakeStore)
+    module(
+        "homeassistant.helpers.device_registry",
+        DeviceRegistry=FakeDeviceRegistry,
+        async_get=device_registry_async_get,
+    )
+    module(
+        "homeassistant.helpers.dispatcher",
+        async_dispatcher_send=async_dispatcher_send,
+        async_dispatcher_connect=async_dispatcher_connect,
+    )
+    module("homeassistant.util")
+    module("homeassistant.util.json", json_loads=json.loads)
+
+
+def install() -> None:
+    if PACKAGE in sys.modules:
+        return
+
+    _install_homeassistant()
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [str(ROOT)]
+    sys.modules[PACKAGE] = package
+
+
+def load(name: str) -> types.ModuleType:
+    install()
+    return importlib.import_module(f"{PACKAGE}.{name}")
+
+
+def reset() -> None:
+    """Drops the process wide singletons, they are bound to the previous event loop."""
+    load("timer_wheel").TimerWheel._instance = None
+    load("metrics").MetricsRegistry._instance = None
+
+
+def run(coro_func: Callable, *args: Any) -> Any:
+    reset()
+
+    async def main() -> Any:
+        hass = FakeHomeAssistant()
+        try:
+            return await coro_func(hass, *args)
+        finally:
+            await hass.async_stop()
+
+    return asyncio.run(main())
+
+
+def discovery_payload(unique_id: str, **device: Any) -> dict[str, Any]:
+    return {
+        "unique_id": unique_id,
+        "name": f"Panel {unique_id}",
+        "device": {
+            "model": "THID",
+            "manufacturer": "HID",
+            "sw_version": "1.0.0",
+            "hw_version": "1.0.0",
+            **device,
+        },
+    }
+
+
+def controller_ids(prefix: str = "HW-THID-") -> Iterator[str]:
+    return (f"{prefix}{index:017d}" for index in itertools.count(1))
@@ -0,0 +1,149 @@
+import asyncio
+import json
+
+import harness
+
+ClimateService = harness.load("climate_service").ClimateService
+ClimateCommands = harness.load("climate_commands").ClimateCommands
+ClimateBridge = harness.load("climate_bridge").ClimateBridge
+DeviceController = harness.load("device_controller").DeviceController
+PublishScheduler = harness.load("publish_scheduler").PublishScheduler
+ClimateCommandScheduler = harness.load("command_scheduler").ClimateCommandScheduler
+MqttCommandRouter = harness.load("command_router").MqttCommandRouter
+MetricsRegistry = harness.load("metrics").MetricsRegistry
+
+CONTROLLER_ID = "HW-THID-00000000000000001"
+TOPIC = f"homeassistant/hid_climate_controller/{CONTROLLER_ID}/services"
+ZONES = ("climate.living_room", "climate.kitchen")
+
+
+async def _setup(hass, zones=ZONES[:1]):
+    climate = harness.FakeClimatePlatform(hass)
+    climate_commands = ClimateCommands(ClimateService(hass))
+    publish_scheduler = PublishScheduler(hass)
+    controller = DeviceController(
+        hass, {"entity_id": CONTROLLER_ID, "device": {}}, publish_scheduler, zones
+    )
+    await controller.initialize()
+
+    bridges = {}
+    for zone in zones:
+        climate.add(zone)
+        bridges[zone] = ClimateBridge(hass, climate_commands, None, {"entity_id": zone})
+        bridges[zone].register_controller(controller)
+
+    router = MqttCommandRouter(
+        hass,
+        publish_scheduler,
+        ClimateCommandScheduler(hass, climate_commands, merge_window=0),
+        {CONTROLLER_ID: controller}.get,
+        {CONTROLLER_ID: bridges}.get,
+    )
+    await router.start()
+    return climate, controller, router
+
+
+async def _command(hass, service, **data):
+    hass.mqtt.publish(f"{TOPIC}/{service}", json.dumps(data))
+    await asyncio.sleep(0.01)
+    (ack,) = hass.mqtt.messages(f"{TOPIC}/{service}/ack")
+    hass.mqtt.published.clear()
+    return json.loads(ack.payload)
+
+
+def _calls(hass):
+    return [(call.service, call.data) for call in hass.services.calls]
+
+
+def test_command_is_executed_and_acknowledged():
+    async def scenario(hass):
+        _, controller, router = await _setup(hass)
+
+        ack = await _command(hass, "set_temperature", message_id=7, temperature=23)
+
+        assert ack == {"message_id": 7, "success": True}
+        metrics = MetricsRegistry.get_instance()
+        assert metrics.get("command_ack_latency", CONTROLLER_ID).count == 1
+        assert metrics.get("commands_failed", CONTROLLER_ID) is None
+        assert _calls(hass) == [
+            ("set_temperature", {"temperature": 23, "entity_id": ZONES[0]})
+        ]
+        await router.stop()
+        await controller.destroy()
+
+    harness.run(scenario)
+
+
+def test_unknown_service_is_rejected_in_the_ack():
+    async def scenario(hass):
+        _, controller, router = await _setup(hass)
+
+        ack = await _command(hass, "self_destruct", message_id=1)
+
+        assert ack["success"] is False
+        assert "self_destruct" in ack["error"]
+        assert _calls(hass) == []
+        await router.stop()
+        await controller.destroy()
+
+    harness.run(scenario)
+
+
+def test_failed_service_call_is_reported_in_the_ack():
+    async def scenario(hass):
+        climate, controller, router = await _setup(hass)
+        climate.failing_services.add("set_fan_mode")
+
+        ack = await _command(hass, "set_fan_mode", message_id=2, fan_mode="auto")
+
+        assert ack == {
+            "message_id": 2,
+            "success": False,
+            "error": "set_fan_mode failed",
+        }
+        metrics = MetricsRegistry.get_instance()
+        assert metrics.get("commands_failed", CONTROLLER_ID).value == 1
+        assert metrics.get("command_ack_latency", CONTROLLER_ID).count == 1
+        await router.stop()
+        await controller.destroy()
+
+    harness.run(scenario)
+
+
+def test_commands_of_a_multi_zone_controller_name_their_zone():
+    async def scenario(hass):
+        _, controller, router = await _setup(hass, ZONES)
+
+        missing = await _command(hass, "turn_off", message_id=1)
+        unknown = await _command(hass, "turn_off", message_id=2, zone="climate.attic")
+        addressed = await _command(hass, "turn_off", message_id=3, zone=ZONES[1])
+
+        assert missing["success"] is False
+        assert unknown["success"] is False
+        assert addressed["success"] is True
+        assert _calls(hass) == [("turn_off", {"entity_id": ZONES[1]})]
+        await router.stop()
+        await controller.destroy()
+
+    harness.run(scenario)
+
+
+def test_commands_from_unregistered_controllers_are_ignored():
+    async def scenario(hass):
+        _, controller, router = await _setup(hass)
+
+        hass.mqtt.publish(
+            "homeassistant/hid_climate_controller/HW-THID-00000000000000002"
+            "/services/turn_off",
+            json.dumps({"message_id": 1}),
+        )
+        await asyncio.sleep(0.01)
+
+        assert (
+            hass.mqtt.messages("homeassistant/hid_climate_controller/+/+/+/ack") == []
+        )
+        assert _calls(hass) == []
+        await router.stop()
+        await controller.destroy()
+
+    harness.run(scenario)
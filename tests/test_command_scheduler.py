@@ -0,0 +1,162 @@
+import asyncio
+
+import harness
+
+ClimateService = harness.load("climate_service").ClimateService
+ClimateCommands = harness.load("climate_commands").ClimateCommands
+ClimateCommandScheduler = harness.load("command_scheduler").ClimateCommandScheduler
+
+ENTITY_ID = "climate.living_room"
+
+
+def _scheduler(hass):
+    climate = harness.FakeClimatePlatform(hass)
+    climate.add(ENTITY_ID)
+    scheduler = ClimateCommandScheduler(
+        hass, ClimateCommands(ClimateService(hass)), merge_window=0.01
+    )
+    return climate, scheduler
+
+
+def _calls(hass):
+    return [(call.service, call.data) for call in hass.services.calls]
+
+
+async def _submit_all(scheduler, *commands):
+    tasks = []
+    for service, data in commands:
+        tasks.append(
+            asyncio.ensure_future(scheduler.submit(service, ENTITY_ID, **data))
+        )
+        await asyncio.sleep(0)
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def test_last_temperature_wins_and_every_submitter_is_resolved():
+    async def scenario(hass):
+        _, scheduler = _scheduler(hass)
+        results = await _submit_all(
+            scheduler,
+            ("set_temperature", {"temperature": 21}),
+            ("set_temperature", {"temperature": 22}),
+            ("set_temperature", {"temperature": 23}),
+        )
+
+        assert results == [None, None, None]
+        assert _calls(hass) == [
+            ("set_temperature", {"temperature": 23, "entity_id": ENTITY_ID})
+        ]
+
+    harness.run(scenario)
+
+
+def test_turn_off_after_set_hvac_mode_leaves_the_thermostat_off():
+    async def scenario(hass):
+        _, scheduler = _scheduler(hass)
+        await _submit_all(
+            scheduler,
+            ("set_hvac_mode", {"hvac_mode": "heat"}),
+            ("turn_off", {}),
+        )
+
+        assert [service for service, _ in _calls(hass)] == ["turn_off"]
+        assert hass.states.get(ENTITY_ID).state == "off"
+
+    harness.run(scenario)
+
+
+def test_set_hvac_mode_after_turn_off_wins():
+    async def scenario(hass):
+        _, scheduler = _scheduler(hass)
+        await _submit_all(
+            scheduler,
+            ("turn_off", {}),
+            ("set_hvac_mode", {"hvac_mode": "cool"}),
+        )
+
+        assert [service for service, _ in _calls(hass)] == ["set_hvac_mode"]
+        assert hass.states.get(ENTITY_ID).state == "cool"
+
+    harness.run(scenario)
+
+
+def test_newer_hvac_mode_overrides_the_one_in_set_temperature():
+    async def scenario(hass):
+        _, scheduler = _scheduler(hass)
+        await _submit_all(
+            scheduler,
+            ("set_temperature", {"temperature": 21, "hvac_mode": "cool"}),
+            ("set_hvac_mode", {"hvac_mode": "heat"}),
+        )
+
+        assert _calls(hass) == [
+            (
+                "set_temperature",
+                {"temperature": 21, "hvac_mode": "heat", "entity_id": ENTITY_ID},
+            )
+        ]
+        assert hass.states.get(ENTITY_ID).state == "heat"
+
+    harness.run(scenario)
+
+
+def test_newer_set_temperature_keeps_its_own_hvac_mode():
+    async def scenario(hass):
+        _, scheduler = _scheduler(hass)
+        await _submit_all(
+            scheduler,
+            ("set_hvac_mode", {"hvac_mode": "heat"}),
+            ("set_temperature", {"temperature": 21, "hvac_mode": "cool"}),
+        )
+
+        assert hass.states.get(ENTITY_ID).state == "cool"
+        assert len(hass.services.calls) == 1
+
+    harness.run(scenario)
+
+
+def test_set_temperature_with_mode_runs_in_order_with_power_commands():
+    async def scenario(hass):
+        _, scheduler = _scheduler(hass)
+        await _submit_all(
+            scheduler,
+            ("set_temperature", {"temperature": 21, "hvac_mode": "cool"}),
+            ("turn_off", {}),
+        )
+
+        assert [service for service, _ in _calls(hass)] == [
+            "set_temperature",
+            "turn_off",
+        ]
+        assert hass.states.get(ENTITY_ID).state == "off"
+
+    harness.run(scenario)
+
+
+def test_failure_is_reported_to_every_merged_submitter():
+    async def scenario(hass):
+        climate, scheduler = _scheduler(hass)
+        climate.failing_services.add("set_fan_mode")
+        results = await _submit_all(
+            scheduler,
+            ("set_fan_mode", {"fan_mode": "low"}),
+            ("set_fan_mode", {"fan_mode": "high"}),
+            ("set_humidity", {"humidity": 40}),
+        )
+
+        assert isinstance(results[0], ValueError)
+        assert isinstance(results[1], ValueError)
+        assert results[2] is None
+
+    harness.run(scenario)
+
+
+def test_invalid_arguments_are_rejected_at_submit_time():
+    async def scenario(hass):
+        _, scheduler = _scheduler(hass)
+        results = await _submit_all(scheduler, ("set_temperature", {"bogus": 1}))
+
+        assert isinstance(results[0], TypeError)
+        assert hass.services.calls == []
+
+    harness.run(scenario)
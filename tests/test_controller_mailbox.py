@@ -0,0 +1,97 @@
+import asyncio
+
+import harness
+
+ControllerMailbox = harness.load("controller_mailbox").ControllerMailbox
+MetricsRegistry = harness.load("metrics").MetricsRegistry
+
+
+def _mailbox(hass, handled, **kwargs):
+    async def handler(item):
+        if item == "boom":
+            raise ValueError(item)
+        handled.append(item)
+
+    return ControllerMailbox(hass, "panel", handler, **kwargs)
+
+
+def test_items_are_handled_in_order():
+    async def scenario(hass):
+        handled = []
+        mailbox = _mailbox(hass, handled)
+        mailbox.start()
+        for item in range(5):
+            mailbox.put(item)
+        await asyncio.sleep(0)
+
+        assert handled == [0, 1, 2, 3, 4]
+        assert len(mailbox) == 0
+        mailbox.cancel()
+
+    harness.run(scenario)
+
+
+def test_full_mailbox_coalesces_into_the_last_item():
+    async def scenario(hass):
+        handled = []
+        mailbox = _mailbox(
+            hass, handled, max_size=2, merge=lambda pending, item: pending + item
+        )
+        for item in ([1], [2], [3], [4]):
+            mailbox.put(item)
+        mailbox.start()
+        await asyncio.sleep(0)
+
+        assert handled == [[1], [2, 3, 4]]
+        assert (
+            MetricsRegistry.get_instance().get("mailbox_overflows", "panel").value == 2
+        )
+        mailbox.cancel()
+
+    harness.run(scenario)
+
+
+def test_full_mailbox_drops_the_oldest_item():
+    async def scenario(hass):
+        handled = []
+        mailbox = _mailbox(hass, handled, max_size=2, policy="drop_oldest")
+        for item in range(4):
+            mailbox.put(item)
+        mailbox.start()
+        await asyncio.sleep(0)
+
+        assert handled == [2, 3]
+        mailbox.cancel()
+
+    harness.run(scenario)
+
+
+def test_failing_item_does_not_stop_the_worker():
+    async def scenario(hass):
+        handled = []
+        mailbox = _mailbox(hass, handled)
+        mailbox.start()
+        for item in ("a", "boom", "b"):
+            mailbox.put(item)
+        await asyncio.sleep(0)
+
+        assert handled == ["a", "b"]
+        mailbox.cancel()
+
+    harness.run(scenario)
+
+
+def test_cleared_items_are_never_handled():
+    async def scenario(hass):
+        handled = []
+        mailbox = _mailbox(hass, handled)
+        mailbox.put("stale")
+        mailbox.clear()
+        mailbox.start()
+        mailbox.put("fresh")
+        await asyncio.sleep(0)
+
+        assert handled == ["fresh"]
+        mailbox.cancel()
+
+    harness.run(scenario)
@@ -0,0 +1,144 @@
+import asyncio
+import json
+
+import harness
+
+ClimateService = harness.load("climate_service").ClimateService
+ClimateCommands = harness.load("climate_commands").ClimateCommands
+ClimateBridge = harness.load("climate_bridge").ClimateBridge
+DeviceController = harness.load("device_controller").DeviceController
+PublishScheduler = harness.load("publish_scheduler").PublishScheduler
+validators = harness.load("validators")
+
+CONTROLLER_ID = "HW-THID-00000000000000001"
+CLIMATE_ID = "climate.living_room"
+STATE_TOPIC = f"homeassistant/hid_climate_controller/{CONTROLLER_ID}/state"
+
+
+async def _setup(hass, **device):
+    climate = harness.FakeClimatePlatform(hass)
+    climate.add(CLIMATE_ID)
+    # Config entries store the device block the way the config flow normalised it
+    discovery_info = validators.normalize_discovery_info(
+        harness.discovery_payload(CONTROLLER_ID, **device)
+    )
+    controller = DeviceController(
+        hass,
+        {"entity_id": CONTROLLER_ID, "device": discovery_info["device"]},
+        PublishScheduler(hass),
+        zones=[CLIMATE_ID],
+    )
+    await controller.initialize()
+    bridge = ClimateBridge(
+        hass,
+        ClimateCommands(ClimateService(hass)),
+        None,
+        {"entity_id": CLIMATE_ID},
+    )
+    bridge.register_controller(controller)
+    hass.bus.async_listen("state_changed", bridge.async_handle_state_changed)
+    return climate, controller, bridge
+
+
+def _published_states(hass):
+    return [json.loads(message.payload) for message in hass.mqtt.messages(STATE_TOPIC)]
+
+
+def test_state_changes_reach_the_controller_as_deltas():
+    async def scenario(hass):
+        _, controller, bridge = await _setup(
+            hass, state_min_interval=0, state_max_latency=0
+        )
+        controller.enqueue_state(bridge.get_full_state_payload(controller))
+        await asyncio.sleep(0.01)
+
+        await hass.services.async_call(
+            "climate",
+            "set_temperature",
+            {"temperature": 22},
+            target={"entity_id": CLIMATE_ID},
+        )
+        await asyncio.sleep(0.01)
+
+        full, delta = _published_states(hass)
+        assert full["type"] == "full"
+        assert delta["type"] == "delta"
+        assert delta["base"] == full["seq"]
+        assert delta["a"] == {"temperature": 22}
+        assert "triggering_entity_id" not in delta
+        assert "triggering_entity_ulid" not in full
+        await controller.destroy()
+
+    harness.run(scenario)
+
+
+def test_changes_caused_by_the_controller_name_it():
+    async def scenario(hass):
+        _, controller, bridge = await _setup(
+            hass, state_min_interval=0, state_max_latency=0
+        )
+        await hass.services.async_call(
+            "climate",
+            "set_temperature",
+            {"temperature": 22},
+            target={"entity_id": CLIMATE_ID},
+            context=harness.Context(parent_id=controller.entity_id_ulid),
+        )
+        await asyncio.sleep(0.01)
+
+        (delta,) = _published_states(hass)
+        assert delta["triggering_entity_id"] == CONTROLLER_ID
+        assert delta["triggering_entity_ulid"] == controller.entity_id_ulid
+        await controller.destroy()
+
+    harness.run(scenario)
+
+
+def test_numeric_strings_from_the_discovery_payload_are_accepted():
+    async def scenario(hass):
+        _, controller, _ = await _setup(
+            hass, state_min_interval="0.01", state_max_latency="0.02"
+        )
+        for temperature in (21, 22, 23):
+            hass.states.async_set(CLIMATE_ID, "heat", {"temperature": temperature})
+            await asyncio.sleep(0)
+
+        await asyncio.sleep(0.05)
+        states = _published_states(hass)
+        assert states[-1]["a"]["temperature"] == 23
+        await controller.destroy()
+
+    harness.run(scenario)
+
+
+def test_a_single_field_string_projects_that_field():
+    async def scenario(hass):
+        _, controller, bridge = await _setup(
+            hass, fields="temperature", state_min_interval=0
+        )
+        assert controller.fields == frozenset({"temperature"})
+
+        payload = bridge.get_full_state_payload(controller)
+        assert payload["a"] == {"temperature": 20.0}
+        await controller.destroy()
+
+    harness.run(scenario)
+
+
+def test_offline_controller_skips_states_until_it_returns():
+    async def scenario(hass):
+        _, controller, bridge = await _setup(hass, state_min_interval=0)
+        controller.set_available(False)
+        hass.states.async_set(CLIMATE_ID, "cool", {"temperature": 18})
+        await asyncio.sleep(0.01)
+        assert _published_states(hass) == []
+
+        controller.set_available(True)
+        controller.enqueue_state(bridge.get_full_state_payload(controller))
+        await asyncio.sleep(0.01)
+        (full,) = _published_states(hass)
+        assert full["type"] == "full"
+        assert full["s"] == "cool"
+        await controller.destroy()
+
+    harness.run(scenario)
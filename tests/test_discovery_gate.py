@@ -0,0 +1,46 @@
+import harness
+
+DiscoveryGate = harness.load("discovery_gate").DiscoveryGate
+
+TOPIC = "homeassistant/hid_climate_controller/HW-THID-00000000000000001/config"
+
+
+def _announcement(payload):
+    return harness.ReceiveMessage(TOPIC, payload, 1, True, TOPIC)
+
+
+def test_identical_announcements_are_dropped_once_processed():
+    gate = DiscoveryGate()
+    assert gate.async_begin(_announcement("a"))
+    gate.async_end(_announcement("a"))
+
+    assert not gate.async_begin(_announcement("a"))
+    assert gate.async_begin(_announcement("b"))
+
+
+def test_discarded_announcement_is_processed_again():
+    gate = DiscoveryGate()
+    gate.async_begin(_announcement("a"))
+    gate.async_end(_announcement("a"))
+
+    gate.async_discard(_announcement("a"))
+    assert gate.async_begin(_announcement("a"))
+
+
+def test_discard_keeps_a_newer_payload():
+    gate = DiscoveryGate()
+    for payload in ("a", "b"):
+        gate.async_begin(_announcement(payload))
+        gate.async_end(_announcement(payload))
+
+    gate.async_discard(_announcement("a"))
+    assert not gate.async_begin(_announcement("b"))
+
+
+def test_changed_payload_during_processing_is_queued():
+    gate = DiscoveryGate()
+    gate.async_begin(_announcement("a"))
+    assert not gate.async_begin(_announcement("b"))
+    assert not gate.async_begin(_announcement("c"))
+
+    assert gate.async_end(_announcement("a")).payload == "c"
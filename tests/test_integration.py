@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import harness
+
+integration = harness.load("integration")
+
+STATE_FULL_FILTER = "homeassistant/hid_climate_controller/+/state/full"
+
+
+async def _setup(hass, count):
+    integration.HIDClimateControllerIntegration._instance = None
+    instance = integration.HIDClimateControllerIntegration.get_instance()
+    await instance.init(hass)
+
+    climate = harness.FakeClimatePlatform(hass)
+    ids = harness.controller_ids()
+    entries = []
+    for index in range(count):
+        climate_id = f"climate.zone_{index}"
+        climate.add(climate_id)
+        controller_id = next(ids)
+        entries.append(
+            harness.FakeConfigEntry(
+                entry_id=f"entry_{index}",
+                unique_id=controller_id,
+                data={
+                    "controller": {"entity_id": controller_id, "device": {}},
+                    "climate": {"entity_id": climate_id},
+                },
+            )
+        )
+    await instance._async_register_device_batch(entries)
+    await asyncio.sleep(0.01)
+    return instance, entries
+
+
+async def _teardown(instance, entries):
+    for entry in entries:
+        await instance._async_unregister_device(entry)
+
+
+def _states(hass, controller_id):
+    return [
+        json.loads(message.payload)
+        for message in hass.mqtt.messages(
+            f"homeassistant/hid_climate_controller/{controller_id}/state"
+        )
+    ]
+
+
+def test_full_state_requests_share_one_subscription():
+    async def scenario(hass):
+        instance, entries = await _setup(hass, 3)
+        subscriptions = [
+            subscription
+            for subscription in hass.mqtt._subscriptions
+            if subscription[1] == STATE_FULL_FILTER
+        ]
+        assert len(subscriptions) == 1
+        await _teardown(instance, entries)
+
+    harness.run(scenario)
+
+
+def test_full_state_request_is_routed_to_the_requesting_controller():
+    async def scenario(hass):
+        instance, entries = await _setup(hass, 2)
+        requester, bystander = (entry.unique_id for entry in entries)
+        # Past the minimum interval after the registration snapshot
+        await asyncio.sleep(0.6)
+        published = {
+            unique_id: len(_states(hass, unique_id))
+            for unique_id in (requester, bystander)
+        }
+
+        hass.mqtt.publish(
+            f"homeassistant/hid_climate_controller/{requester}/state/full", ""
+        )
+        hass.mqtt.publish(
+            "homeassistant/hid_climate_controller/HW-THID-unknown/state/full", ""
+        )
+        await asyncio.sleep(0.01)
+
+        states = _states(hass, requester)
+        assert len(states) == published[requester] + 1
+        assert states[-1]["type"] == "full"
+        assert len(_states(hass, bystander)) == published[bystander]
+        await _teardown(instance, entries)
+
+    harness.run(scenario)
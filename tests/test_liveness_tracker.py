@@ -0,0 +1,89 @@
+import asyncio
+
+import harness
+
+LivenessTracker = harness.load("liveness_tracker").LivenessTracker
+
+DEVICE_ID = "HW-THID-00000000000000001"
+TOPIC = f"homeassistant/hid_climate_controller/{DEVICE_ID}/availability"
+
+
+async def _tracker(hass, timeout=0.05):
+    changes = []
+    tracker = LivenessTracker(
+        hass,
+        lambda unique_id, available: changes.append((unique_id, available)),
+        timeout,
+    )
+    await tracker.start()
+    return tracker, changes
+
+
+def test_unknown_devices_are_assumed_online():
+    async def scenario(hass):
+        tracker, changes = await _tracker(hass)
+
+        assert tracker.is_available(DEVICE_ID)
+        assert changes == []
+        await tracker.stop()
+
+    harness.run(scenario)
+
+
+def test_missing_heartbeat_marks_the_device_offline():
+    async def scenario(hass):
+        tracker, changes = await _tracker(hass)
+        hass.mqtt.publish(TOPIC, "online")
+        await asyncio.sleep(0.01)
+        assert tracker.is_available(DEVICE_ID)
+
+        await asyncio.sleep(0.1)
+        assert not tracker.is_available(DEVICE_ID)
+        assert changes == [(DEVICE_ID, False)]
+        await tracker.stop()
+
+    harness.run(scenario)
+
+
+def test_heartbeats_rearm_the_deadline():
+    async def scenario(hass):
+        tracker, changes = await _tracker(hass)
+        for _ in range(5):
+            hass.mqtt.publish(TOPIC, "online")
+            await asyncio.sleep(0.02)
+
+        assert tracker.is_available(DEVICE_ID)
+        assert changes == []
+        await tracker.stop()
+
+    harness.run(scenario)
+
+
+def test_last_will_marks_the_device_offline_until_it_returns():
+    async def scenario(hass):
+        tracker, changes = await _tracker(hass, timeout=10)
+        hass.mqtt.publish(TOPIC, "OFFLINE\n")
+        await asyncio.sleep(0.01)
+        assert not tracker.is_available(DEVICE_ID)
+
+        hass.mqtt.publish(TOPIC, "online")
+        hass.mqtt.publish(TOPIC, "rebooting")
+        await asyncio.sleep(0.01)
+        assert tracker.is_available(DEVICE_ID)
+        assert changes == [(DEVICE_ID, False), (DEVICE_ID, True)]
+        await tracker.stop()
+
+    harness.run(scenario)
+
+
+def test_stop_cancels_pending_deadlines():
+    async def scenario(hass):
+        tracker, changes = await _tracker(hass)
+        hass.mqtt.publish(TOPIC, "online")
+        await asyncio.sleep(0.01)
+        await tracker.stop()
+
+        await asyncio.sleep(0.1)
+        assert changes == []
+
+    harness.run(scenario)
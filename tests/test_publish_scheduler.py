@@ -0,0 +1,58 @@
+import asyncio
+
+import harness
+
+PublishScheduler = harness.load("publish_scheduler").PublishScheduler
+const = harness.load("const")
+
+
+def _published(hass):
+    return [message.topic for message in hass.mqtt.published]
+
+
+def test_higher_priority_goes_first_and_devices_take_turns():
+    async def scenario(hass):
+        scheduler = PublishScheduler(hass, rate=1000, burst=1)
+        scheduler.publish("first", b"")
+        for topic, device in (("a1", "a"), ("a2", "a"), ("b1", "b"), ("a3", "a")):
+            scheduler.publish(topic, b"", device=device)
+        scheduler.publish("ack", b"", priority=const.PUBLISH_PRIORITY_ACK, device="b")
+        scheduler.publish(
+            "echo", b"", priority=const.PUBLISH_PRIORITY_INTERACTIVE, device="a"
+        )
+        await asyncio.sleep(0.05)
+
+        assert _published(hass) == ["first", "ack", "echo", "a1", "b1", "a2", "a3"]
+
+    harness.run(scenario)
+
+
+def test_token_bucket_caps_the_message_rate():
+    async def scenario(hass):
+        scheduler = PublishScheduler(hass, rate=100, burst=2)
+        futures = [scheduler.publish(f"topic/{index}", b"") for index in range(5)]
+        await asyncio.sleep(0)
+        assert len(hass.mqtt.published) == 2
+
+        started_at = hass.loop.time()
+        await asyncio.gather(*futures)
+        # Three more tokens at 100 per second
+        assert hass.loop.time() - started_at >= 0.025
+        assert len(hass.mqtt.published) == 5
+
+    harness.run(scenario)
+
+
+def test_cancel_fails_every_queued_message():
+    async def scenario(hass):
+        scheduler = PublishScheduler(hass, rate=1, burst=1)
+        sent = scheduler.publish("sent", b"")
+        queued = scheduler.publish("queued", b"")
+        scheduler.cancel()
+        await asyncio.sleep(0)
+
+        await sent
+        assert queued.cancelled()
+        assert _published(hass) == ["sent"]
+
+    harness.run(scenario)
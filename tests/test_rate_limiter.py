@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import harness
+
+utilities = harness.load("utilities")
+RateLimiter = utilities.RateLimiter
+
+
+def test_repeated_key_is_throttled_within_the_interval():
+    rate_limiter = RateLimiter(50)
+
+    assert rate_limiter.try_acquire("a")
+    assert not rate_limiter.try_acquire("a")
+    assert rate_limiter.try_acquire("b")
+    assert (rate_limiter.accepted, rate_limiter.throttled) == (2, 1)
+
+
+def test_key_is_accepted_again_and_evicted_once_the_interval_passed():
+    rate_limiter = RateLimiter(10)
+    rate_limiter.try_acquire("a")
+    time.sleep(0.02)
+
+    assert rate_limiter.try_acquire("b")
+    # "a" expired and was evicted by the call for "b"
+    assert len(rate_limiter) == 1
+    assert rate_limiter.try_acquire("a")
+
+
+def test_size_is_bounded_by_evicting_the_oldest_key():
+    rate_limiter = RateLimiter(60000, max_size=3)
+    for key in range(5):
+        rate_limiter.try_acquire(key)
+
+    assert len(rate_limiter) == 3
+    assert rate_limiter.try_acquire(0)
+    assert not rate_limiter.try_acquire(4)
+
+
+def test_throttle_drops_calls_with_the_same_arguments():
+    calls = []
+
+    @utilities.throttle(60000)
+    def handle(value):
+        calls.append(value)
+        return value
+
+    assert handle(1) == 1
+    assert handle(1) is None
+    assert handle(2) == 2
+    assert calls == [1, 2]
+
+
+def test_async_throttle_runs_the_last_suppressed_call_when_trailing():
+    async def scenario(hass):
+        calls = []
+
+        @utilities.async_throttle(20, key=lambda value: "key", trailing=True)
+        async def handle(value):
+            calls.append(value)
+
+        for value in range(5):
+            await handle(value)
+        assert calls == [0]
+
+        await asyncio.sleep(0.05)
+        assert calls == [0, 4]
+        assert handle.rate_limiter.trailing == 1
+
+    harness.run(scenario)
@@ -0,0 +1,126 @@
+import harness
+
+state_delta = harness.load("state_delta")
+
+STATE = {"s": "heat", "a": {"temperature": 20, "current_temperature": 19.5}}
+
+
+def _with_temperature(state, temperature):
+    return {**state, "a": {**state["a"], "temperature": temperature}}
+
+
+def _delta(previous, current, base, sequence):
+    return state_delta.build_delta_payload(previous, current, base, sequence)
+
+
+def test_delta_merged_into_pending_full_stays_full():
+    full = state_delta.build_full_payload(STATE, 5)
+    delta = _delta(STATE, _with_temperature(STATE, 21), 5, 6)
+
+    merged = state_delta.merge_state_payloads(full, delta)
+
+    assert merged["type"] == "full"
+    assert merged["seq"] == 6
+    assert merged["a"] == {"temperature": 21, "current_temperature": 19.5}
+
+
+def test_deltas_merge_into_one_spanning_delta():
+    first = _with_temperature(STATE, 21)
+    second = {**first, "a": {"temperature": 21}}
+    delta = state_delta.merge_state_payloads(
+        _delta(STATE, first, 5, 6), _delta(first, second, 6, 7)
+    )
+
+    assert delta["type"] == "delta"
+    assert (delta["base"], delta["seq"]) == (5, 7)
+    assert delta["a"] == {"temperature": 21}
+    assert delta["r"] == ["current_temperature"]
+
+
+def test_merged_delta_only_names_the_newest_triggering_controller():
+    first = _with_temperature(STATE, 21)
+    triggered = {
+        **_delta(STATE, first, 5, 6),
+        "triggering_entity_ulid": "01ULID",
+        "triggering_entity_id": "HW-THID-00000000000000001",
+    }
+    delta = state_delta.merge_state_payloads(
+        triggered, _delta(first, _with_temperature(first, 22), 6, 7)
+    )
+
+    assert "triggering_entity_ulid" not in delta
+    assert "triggering_entity_id" not in delta
+
+
+def test_confirm_merged_into_pending_full_keeps_confirmed_values():
+    confirmed = _with_temperature(STATE, 22)
+    full = state_delta.build_full_payload(STATE, 5)
+    delta = _delta(STATE, confirmed, 5, 6)
+    confirm = state_delta.build_confirm_payload(5, 6, delta)
+
+    merged = state_delta.strip_confirmed_deltas(
+        state_delta.merge_state_payloads(full, confirm)
+    )
+
+    assert merged["type"] == "full"
+    assert merged["seq"] == 6
+    assert merged["a"]["temperature"] == 22
+
+
+def test_confirm_merged_into_pending_delta_keeps_confirmed_values():
+    changed = _with_temperature(STATE, 20.5)
+    confirmed = _with_temperature(STATE, 22)
+    pending = _delta(STATE, changed, 5, 6)
+    confirm = state_delta.build_confirm_payload(6, 7, _delta(changed, confirmed, 6, 7))
+
+    merged = state_delta.merge_state_payloads(pending, confirm)
+
+    assert merged["type"] == "delta"
+    assert (merged["base"], merged["seq"]) == (5, 7)
+    assert merged["a"]["temperature"] == 22
+
+
+def test_consecutive_confirms_stay_a_confirm():
+    first = _with_temperature(STATE, 21)
+    second = _with_temperature(STATE, 22)
+    merged = state_delta.merge_state_payloads(
+        state_delta.build_confirm_payload(5, 6, _delta(STATE, first, 5, 6)),
+        state_delta.build_confirm_payload(6, 7, _delta(first, second, 6, 7)),
+    )
+
+    assert state_delta.strip_confirmed_deltas(merged) == {
+        "type": "confirm",
+        "base": 5,
+        "seq": 7,
+    }
+
+    # A later correction falls back on everything the confirms covered
+    third = {**second, "s": "cool"}
+    corrected = state_delta.merge_state_payloads(merged, _delta(second, third, 7, 8))
+    assert corrected["type"] == "delta"
+    assert (corrected["base"], corrected["seq"]) == (5, 8)
+    assert corrected["s"] == "cool"
+    assert corrected["a"]["temperature"] == 22
+
+
+def test_full_replaces_pending_confirm():
+    confirm = state_delta.build_confirm_payload(5, 6, _delta(STATE, STATE, 5, 6))
+    full = state_delta.build_full_payload(STATE, 9)
+
+    assert state_delta.merge_state_payloads(confirm, full) is full
+
+
+def test_strip_confirmed_deltas_handles_zones():
+    confirm = state_delta.build_confirm_payload(1, 2, _delta(STATE, STATE, 1, 2))
+    payload = state_delta.build_zones_payload({"climate.a": confirm})
+
+    assert state_delta.strip_confirmed_deltas(payload) == {
+        "zones": {"climate.a": {"type": "confirm", "base": 1, "seq": 2}}
+    }
+
+
+def test_is_echo_of_requires_every_changed_value_to_be_expected():
+    delta = _delta(STATE, _with_temperature(STATE, 22), 5, 6)
+
+    assert state_delta.is_echo_of(delta, {"a": {"temperature": 22}})
+    assert not state_delta.is_echo_of(delta, {"a": {"temperature": 21}})
@@ -0,0 +1,100 @@
+import asyncio
+import random
+
+import harness
+
+TimerWheel = harness.load("timer_wheel").TimerWheel
+
+
+def test_timers_fire_in_deadline_order():
+    async def scenario(hass):
+        wheel = TimerWheel.get_instance()
+        fired = []
+        for delay in (0.03, 0.01, 0.02):
+            wheel.schedule(delay, fired.append, delay)
+
+        await asyncio.sleep(0.06)
+        assert fired == [0.01, 0.02, 0.03]
+        assert len(wheel) == 0
+
+    harness.run(scenario)
+
+
+def test_cancelled_timer_never_fires():
+    async def scenario(hass):
+        wheel = TimerWheel.get_instance()
+        fired = []
+        handle = wheel.schedule(0.01, fired.append, "cancelled")
+        wheel.schedule(0.02, fired.append, "kept")
+        handle.cancel()
+
+        assert handle.cancelled()
+        await asyncio.sleep(0.04)
+        assert fired == ["kept"]
+
+    harness.run(scenario)
+
+
+def test_timers_on_upper_levels_fire_after_cascading():
+    async def scenario(hass):
+        # 1ms ticks and a 256 slot first level, so these live on the upper levels
+        wheel = TimerWheel(resolution=0.001, level_bits=(4, 4, 4))
+        loop = hass.loop
+        fired = {}
+        deadlines = {}
+        for delay in (0.005, 0.03, 0.3, 0.5):
+            deadlines[delay] = loop.time() + delay
+            wheel.schedule(delay, lambda key: fired.setdefault(key, loop.time()), delay)
+
+        await asyncio.sleep(0.6)
+        assert set(fired) == set(deadlines)
+        for delay, fired_at in fired.items():
+            assert fired_at >= deadlines[delay] - 0.001
+            assert fired_at - deadlines[delay] < 0.05
+
+    harness.run(scenario)
+
+
+def test_random_schedule_and_cancel():
+    async def scenario(hass):
+        wheel = TimerWheel.get_instance()
+        loop = hass.loop
+        rng = random.Random(7)
+        fired = {}
+        handles = {}
+        deadlines = {}
+        for index in range(500):
+            delay = rng.uniform(0, 0.2)
+            deadlines[index] = loop.time() + delay
+            handles[index] = wheel.schedule(
+                delay, lambda key: fired.setdefault(key, loop.time()), index
+            )
+
+        cancelled = set(rng.sample(sorted(handles), 100))
+        for index in cancelled:
+            handles[index].cancel()
+
+        await asyncio.sleep(0.3)
+        assert set(fired) == set(handles) - cancelled
+        for index, fired_at in fired.items():
+            assert fired_at >= deadlines[index] - wheel._resolution
+        assert len(wheel) == 0
+
+    harness.run(scenario)
+
+
+def test_failing_callback_does_not_stop_the_wheel():
+    async def scenario(hass):
+        wheel = TimerWheel.get_instance()
+        fired = []
+
+        def fail():
+            raise RuntimeError("boom")
+
+        wheel.schedule(0.01, fail)
+        wheel.schedule(0.01, fired.append, "after")
+
+        await asyncio.sleep(0.03)
+        assert fired == ["after"]
+
+    harness.run(scenario)
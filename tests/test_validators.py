@@ -0,0 +1,105 @@
+import pytest
+
+import harness
+
+validators = harness.load("validators")
+
+UNIQUE_ID = "HW-THID-00000000000000001"
+
+
+def _config(**overrides):
+    return {
+        "controller_entity_id": UNIQUE_ID,
+        "controller_name": "Living room",
+        "climate_entity_id": "climate.living_room",
+        **overrides,
+    }
+
+
+def _assert_paths_agree(fast_path, schema, data):
+    try:
+        schema(data)
+    except validators.Invalid:
+        schema_valid = False
+    else:
+        schema_valid = True
+
+    # The fast path may defer to the schema, but never accept what it rejects
+    assert not fast_path(data) or schema_valid
+
+
+def test_well_formed_discovery_payload_takes_the_fast_path():
+    assert validators._is_valid_discovery_info(harness.discovery_payload(UNIQUE_ID))
+    assert (
+        validators.validate_discovery_info(harness.discovery_payload(UNIQUE_ID)) == {}
+    )
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {**harness.discovery_payload(UNIQUE_ID), "name": None},
+        harness.discovery_payload(UNIQUE_ID, model=None),
+        harness.discovery_payload(UNIQUE_ID, manufacturer=None),
+        harness.discovery_payload(UNIQUE_ID, sw_version="1.0"),
+        {**harness.discovery_payload(UNIQUE_ID), "unique_id": "HW-THID-1"},
+        {**harness.discovery_payload(UNIQUE_ID), "device": None},
+    ],
+)
+def test_discovery_fast_path_never_accepts_what_the_schema_rejects(payload):
+    assert not validators._is_valid_discovery_info(payload)
+    _assert_paths_agree(
+        validators._is_valid_discovery_info, validators.DISCOVERY_INFO_SCHEMA, payload
+    )
+    assert validators.validate_discovery_info(payload)
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        _config(),
+        _config(climate_entity_id=["climate.a", "climate.b"]),
+        _config(controller_name=None),
+        _config(controller_name=1),
+        _config(climate_entity_id=[]),
+        _config(controller_entity_id="bogus"),
+    ],
+)
+def test_config_fast_path_never_accepts_what_the_schema_rejects(config):
+    _assert_paths_agree(validators._is_valid_config, validators.CONFIG_SCHEMA, config)
+
+
+def test_fast_path_payload_is_stored_as_is():
+    payload = harness.discovery_payload(UNIQUE_ID)
+    assert validators.normalize_discovery_info(payload) is payload
+
+
+def test_device_settings_are_coerced_before_they_are_stored():
+    payload = harness.discovery_payload(
+        UNIQUE_ID, state_min_interval="0.25", state_max_latency="1", fields="s"
+    )
+    device = validators.normalize_discovery_info(payload)["device"]
+    assert device["state_min_interval"] == 0.25
+    assert device["state_max_latency"] == 1.0
+    assert type(device["state_max_latency"]) is float
+    assert device["fields"] == ["s"]
+
+
+def test_null_controller_name_is_reported():
+    assert validators.validate_config(_config(controller_name=None))
+
+
+@pytest.mark.parametrize(
+    ("payload", "path"),
+    [
+        ({**harness.discovery_payload(UNIQUE_ID), "name": None}, "name"),
+        (harness.discovery_payload(UNIQUE_ID, model=None), "device.model"),
+        (
+            harness.discovery_payload(UNIQUE_ID, manufacturer=None),
+            "device.manufacturer",
+        ),
+    ],
+)
+def test_null_discovery_values_are_reported(payload, path):
+    assert not validators._is_valid_discovery_info(payload)
+    assert path in validators.validate_discovery_info(payload)
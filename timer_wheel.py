@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import logging
+import asyncio
+import math
+
+from typing import Any, Callable
+
+from homeassistant.core import callback
+
+from .const import TIMER_WHEEL_RESOLUTION, TIMER_WHEEL_LEVEL_BITS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TimerWheelHandle:
+    __slots__ = ("_wheel", "deadline", "_callback", "_args", "_level", "_slot")
+
+    def __init__(
+        self,
+        wheel: TimerWheel,
+        deadline: int,
+        callback: Callable[..., Any],
+        args: tuple,
+    ) -> None:
+        self._wheel = wheel
+        self.deadline = deadline
+        self._callback = callback
+        self._args = args
+        self._level = None
+        self._slot = None
+
+    def cancel(self) -> None:
+        self._wheel._cancel(self)
+
+    def cancelled(self) -> bool:
+        return self._callback is None
+
+
+class TimerWheel:
+    """Hierarchical timer wheel shared by all per-device timers.
+
+    Scheduling and cancelling are O(1) and the whole wheel is driven by a single
+    event loop callback, armed for the next tick that has work to do.
+    """
+
+    _instance = None
+
+    @staticmethod
+    def get_instance() -> TimerWheel:
+        if TimerWheel._instance is None:
+            TimerWheel._instance = TimerWheel()
+        return TimerWheel._instance
+
+    def __init__(
+        self,
+        resolution: float = TIMER_WHEEL_RESOLUTION,
+        level_bits: tuple[int, ...] = TIMER_WHEEL_LEVEL_BITS,
+    ) -> None:
+        self._resolution = resolution
+        self._shifts = []
+        self._masks = []
+        self._spans = []
+        shift = 0
+        for bits in level_bits:
+            self._shifts.append(shift)
+            self._masks.append((1 << bits) - 1)
+            self._spans.append(1 << (shift + bits))
+            shift += bits
+        self._levels = [[set() for _ in range(1 << bits)] for bits in level_bits]
+        self._counts = [0] * len(level_bits)
+        self._size = 0
+        self._tick = 0
+        self._loop = None
+        self._origin = None
+        self._wake_handle = None
+        self._wake_tick = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @callback
+    def schedule(
+        self, delay: float, callback: Callable[..., Any], *args: Any
+    ) -> TimerWheelHandle:
+        return self.schedule_at(self._get_loop().time() + delay, callback, *args)
+
+    @callback
+    def schedule_at(
+        self, when: float, callback: Callable[..., Any], *args: Any
+    ) -> TimerWheelHandle:
+        loop = self._get_loop()
+        if self._size == 0:
+            self._tick = self._time_to_tick(loop.time())
+
+        deadline = max(
+            self._tick + 1, math.ceil((when - self._origin) / self._resolution)
+        )
+        handle = TimerWheelHandle(self, deadline, callback, args)
+        self._insert(handle)
+        self._size += 1
+
+        if self._wake_tick is None or deadline < self._wake_tick:
+            self._schedule_wake(deadline)
+        return handle
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._origin = self._loop.time()
+        return self._loop
+
+    def _time_to_tick(self, when: float) -> int:
+        return int((when - self._origin) / self._resolution)
+
+    def _insert(self, handle: TimerWheelHandle) -> None:
+        delta = handle.deadline - self._tick
+        last_level = len(self._levels) - 1
+        for level, span in enumerate(self._spans):
+            if delta < span or level == last_level:
+                break
+
+        # Timers beyond the last level wait in its furthest slot and are re-placed on cascade
+        deadline = min(handle.deadline, self._tick + self._spans[last_level] - 1)
+        deadline = max(deadline, self._tick)
+        slot = self._levels[level][
+            (deadline >> self._shifts[level]) & self._masks[level]
+        ]
+        slot.add(handle)
+        handle._level = level
+        handle._slot = slot
+        self._counts[level] += 1
+
+    def _cancel(self, handle: TimerWheelHandle) -> None:
+        if handle._slot is not None:
+            handle._slot.discard(handle)
+            handle._slot = None
+            self._counts[handle._level] -= 1
+            self._size -= 1
+        handle._callback = None
+
+    @callback
+    def _async_tick(self) -> None:
+        wake_tick = self._wake_tick
+        self._wake_handle = None
+        self._wake_tick = None
+
+        self._advance(max(self._time_to_tick(self._loop.time()), wake_tick or 0))
+        self._schedule_next_wake()
+
+    def _advance(self, target: int) -> None:
+        mask = self._masks[0]
+        while self._tick < target:
+            if self._size == 0:
+                self._tick = target
+                return
+
+            if self._counts[0] == 0:
+                # Nothing can expire before the next cascade, skip the empty ticks
+                boundary = (self._tick | mask) + 1
+                if boundary > target:
+                    self._tick = target
+                    return
+                self._tick = boundary - 1
+
+            self._tick += 1
+            if self._tick & mask == 0:
+                self._cascade()
+            self._expire(self._levels[0][self._tick & mask])
+
+    def _cascade(self) -> None:
+        for level in range(1, len(self._levels)):
+            index = (self._tick >> self._shifts[level]) & self._masks[level]
+            slot = self._levels[level][index]
+            if slot:
+                handles = list(slot)
+                slot.clear()
+                self._counts[level] -= len(handles)
+                for handle in handles:
+                    self._insert(handle)
+
+            if index != 0:
+                return
+
+    def _expire(self, slot: set[TimerWheelHandle]) -> None:
+        if not slot:
+            return
+
+        handles = list(slot)
+        slot.clear()
+        self._counts[0] -= len(handles)
+        self._size -= len(handles)
+
+        for handle in handles:
+            timer_callback, args = handle._callback, handle._args
+            handle._slot = None
+            handle._callback = None
+            if timer_callback is None:
+                continue
+            try:
+                timer_callback(*args)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Timer callback %s failed", timer_callback)
+
+    def _schedule_next_wake(self) -> None:
+        if self._size == 0:
+            return
+
+        # Upper levels need the next cascade, level 0 its first non-empty slot
+        mask = self._masks[0]
+        next_tick = (self._tick | mask) + 1 if self._size > self._counts[0] else None
+        if self._counts[0]:
+            for tick in range(self._tick + 1, self._tick + mask + 2):
+                if self._levels[0][tick & mask]:
+                    next_tick = tick if next_tick is None else min(next_tick, tick)
+                    break
+
+        self._schedule_wake(next_tick)
+
+    def _schedule_wake(self, tick: int) -> None:
+        if self._wake_handle:
+            self._wake_handle.cancel()
+
+        self._wake_tick = tick
+        self._wake_handle = self._loop.call_at(
+            self._origin + tick * self._resolution, self._async_tick
+        )
@@ -1,13 +1,24 @@
+import asyncio
 import hashlib
 import base64
 import functools
 import time
 
+from collections import OrderedDict
+from typing import Any
+
+from .const import CLIMATE_KEY
+from .timer_wheel import TimerWheel
+
+ULID_CACHE_MAX_SIZE = 4096
+THROTTLE_CACHE_MAX_SIZE = 1024
+
 
 class Utilities:
     """Class for UlidUtilities."""
 
     @staticmethod
+    @functools.lru_cache(maxsize=ULID_CACHE_MAX_SIZE)
     def encode_string_as_ulid(input_string: str) -> str:
         # Generate a SHA256 hash of the string
         hash_result = hashlib.sha256(input_string.encode()).digest()
@@ -18,45 +29,134 @@ class Utilities:
         # Return the first 26 characters
         return encoded[:26]
 
+    @staticmethod
+    def get_climate_configs(data: dict[str, Any]) -> list[dict[str, Any]]:
+        # Entries linked to a single climate entity store a mapping, multi-zone ones a list
+        climate_config = data.get(CLIMATE_KEY) or []
+        if isinstance(climate_config, dict):
+            return [climate_config]
+        return list(climate_config)
+
+
+class RateLimiter:
+    """Remembers the last accepted call per key, bounded in size and evicted by age."""
+
+    def __init__(
+        self, milliseconds: float, max_size: int = THROTTLE_CACHE_MAX_SIZE
+    ) -> None:
+        self._interval = milliseconds / 1000
+        self._max_size = max_size
+        self._last_called = OrderedDict()
+        self.accepted = 0
+        self.throttled = 0
+        self.trailing = 0
+
+    def __len__(self) -> int:
+        return len(self._last_called)
+
+    def try_acquire(self, key) -> bool:
+        now = time.monotonic()
+        self._evict_expired(now)
+
+        last_called = self._last_called.get(key)
+        if last_called is not None and now - last_called < self._interval:
+            self.throttled += 1
+            return False
+
+        self.acquire(key, now)
+        self.accepted += 1
+        return True
+
+    def acquire(self, key, now: float | None = None) -> None:
+        self._last_called[key] = time.monotonic() if now is None else now
+        self._last_called.move_to_end(key)
+        if len(self._last_called) > self._max_size:
+            self._last_called.popitem(last=False)
+
+    def remaining(self, key) -> float:
+        last_called = self._last_called.get(key)
+        if last_called is None:
+            return 0
+        return max(0, self._interval - (time.monotonic() - last_called))
+
+    def _evict_expired(self, now: float) -> None:
+        while self._last_called:
+            key, last_called = next(iter(self._last_called.items()))
+            if now - last_called < self._interval:
+                return
+            del self._last_called[key]
+
+
+def _default_throttle_key(*args, **kwargs):
+    key = tuple(args) + tuple(kwargs.items())
+    try:
+        hash(key)
+    except TypeError:
+        return repr(key)
+    return key
+
 
-def throttle(milliseconds):
-    """Throttle function call if called with same args within the specified timeout."""
+def throttle(milliseconds, key=None, max_size=THROTTLE_CACHE_MAX_SIZE):
+    """Throttle function call if called with the same key within the specified timeout."""
+    key_func = key or _default_throttle_key
 
     def decorator(fn):
-        cache = {}
+        rate_limiter = RateLimiter(milliseconds, max_size)
 
         @functools.wraps(fn)
         def wrapper(*args, **kwargs):
-            key = tuple(args) + tuple(kwargs.items())
-            current_time = time.time() * 1000  # convert to milliseconds
-
-            if key in cache and current_time - cache[key] < milliseconds:
-                print(f"Throttled: {fn.__name__}({args}, {kwargs})")
+            if not rate_limiter.try_acquire(key_func(*args, **kwargs)):
                 return None
 
-            cache[key] = current_time
             return fn(*args, **kwargs)
 
+        wrapper.rate_limiter = rate_limiter
         return wrapper
 
     return decorator
 
 
-def async_throttle(ms):
+def async_throttle(ms, key=None, trailing=False, max_size=THROTTLE_CACHE_MAX_SIZE):
+    """Throttle coroutine calls per key. With trailing=True the last suppressed
+    call of a window runs once the window has elapsed."""
+    key_func = key or _default_throttle_key
+
     def decorator(fn):
-        last_called = {}
+        rate_limiter = RateLimiter(ms, max_size)
+        trailing_calls = {}
+
+        def run_trailing_call(call_key):
+            args, kwargs, _ = trailing_calls.pop(call_key)
+            rate_limiter.acquire(call_key)
+            rate_limiter.trailing += 1
+            asyncio.get_running_loop().create_task(fn(*args, **kwargs))
 
         @functools.wraps(fn)
         async def wrapper(*args, **kwargs):
-            now = time.time()
-            key = tuple(args) + tuple(kwargs.items())
-
-            if key in last_called and now - last_called[key] < ms / 1000:
-                return
-
-            last_called[key] = now
-            return await fn(*args, **kwargs)
-
+            call_key = key_func(*args, **kwargs)
+
+            if rate_limiter.try_acquire(call_key):
+                trailing_call = trailing_calls.pop(call_key, None)
+                if trailing_call:
+                    trailing_call[2].cancel()
+                return await fn(*args, **kwargs)
+
+            if trailing:
+                trailing_call = trailing_calls.get(call_key)
+                handle = (
+                    trailing_call[2]
+                    if trailing_call
+                    else TimerWheel.get_instance().schedule(
+                        rate_limiter.remaining(call_key),
+                        run_trailing_call,
+                        call_key,
+                    )
+                )
+                trailing_calls[call_key] = (args, kwargs, handle)
+
+            return None
+
+        wrapper.rate_limiter = rate_limiter
         return wrapper
 
     return decorator
@@ -17,6 +17,17 @@ from .const import (
     DEVICE_MANUFACTURER_KEY,
     DEVICE_SW_VERSION_KEY,
     DEVICE_HW_VERSION_KEY,
+    DEVICE_STATE_MIN_INTERVAL_KEY,
+    DEVICE_STATE_MAX_LATENCY_KEY,
+    DEVICE_STATE_QOS_KEY,
+    DEVICE_WIRE_FORMAT_KEY,
+    WIRE_FORMAT_JSON,
+    WIRE_FORMAT_MSGPACK,
+    DEVICE_MAILBOX_POLICY_KEY,
+    DEVICE_FIELDS_KEY,
+    DEVICE_ECHO_SUPPRESSION_KEY,
+    MAILBOX_POLICY_COALESCE,
+    MAILBOX_POLICY_DROP_OLDEST,
     CONTROLLER_ENTITY_ID_KEY,
     CONTROLLER_NAME_KEY,
     CLIMATE_ENTITY_ID_KEY,
@@ -37,6 +48,21 @@ DISCOVERY_INFO_SCHEMA = vol.Schema(
             vol.Optional(DEVICE_HW_VERSION_KEY, default=""): vol.All(
                 cv.string, vol.Match(DEVICE_HW_VERSION_REGEX)
             ),
+            vol.Optional(DEVICE_STATE_MIN_INTERVAL_KEY): vol.All(
+                vol.Coerce(float), vol.Range(min=0)
+            ),
+            vol.Optional(DEVICE_STATE_MAX_LATENCY_KEY): vol.All(
+                vol.Coerce(float), vol.Range(min=0)
+            ),
+            vol.Optional(DEVICE_STATE_QOS_KEY): vol.In([0, 1, 2]),
+            vol.Optional(DEVICE_WIRE_FORMAT_KEY, default=WIRE_FORMAT_JSON): vol.In(
+                [WIRE_FORMAT_JSON, WIRE_FORMAT_MSGPACK]
+            ),
+            vol.Optional(DEVICE_MAILBOX_POLICY_KEY): vol.In(
+                [MAILBOX_POLICY_COALESCE, MAILBOX_POLICY_DROP_OLDEST]
+            ),
+            vol.Optional(DEVICE_FIELDS_KEY): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional(DEVICE_ECHO_SUPPRESSION_KEY): bool,
         },
     },
     extra=vol.ALLOW_EXTRA,
@@ -50,12 +76,94 @@ CONFIG_SCHEMA = vol.Schema(
         vol.Optional(CONTROLLER_NAME_KEY, default=""): cv.string,
         vol.Required(
             CLIMATE_ENTITY_ID_KEY, msg=REQUIRED_INPUT_ERROR, default=""
-        ): cv.string,
+        ): vol.Any(cv.string, vol.All([cv.string], vol.Length(min=1))),
     }
 )
 
 
+_DEVICE_STRING_KEYS = (DEVICE_MODEL_KEY, DEVICE_MANUFACTURER_KEY)
+_DEVICE_VERSION_PATTERNS = (
+    (DEVICE_SW_VERSION_KEY, DEVICE_SW_VERSION_REGEX),
+    (DEVICE_HW_VERSION_KEY, DEVICE_HW_VERSION_REGEX),
+)
+_DEVICE_SCHEMA_ONLY_KEYS = frozenset(
+    (
+        DEVICE_STATE_MIN_INTERVAL_KEY,
+        DEVICE_STATE_MAX_LATENCY_KEY,
+        DEVICE_STATE_QOS_KEY,
+        DEVICE_WIRE_FORMAT_KEY,
+        DEVICE_MAILBOX_POLICY_KEY,
+        DEVICE_FIELDS_KEY,
+        DEVICE_ECHO_SUPPRESSION_KEY,
+    )
+)
+_CONFIG_KEYS = frozenset(
+    (CONTROLLER_ENTITY_ID_KEY, CONTROLLER_NAME_KEY, CLIMATE_ENTITY_ID_KEY)
+)
+
+
+def _is_valid_discovery_info(data: Any) -> bool:
+    """Accepts the common well-formed payload without traversing the schema.
+
+    Anything it does not recognise is left to DISCOVERY_INFO_SCHEMA, so a False
+    result only means the detailed validation has to run.
+    """
+    if type(data) is not dict:
+        return False
+
+    unique_id = data.get(DEVICE_UNIQUE_ID_KEY)
+    if type(unique_id) is not str or not DEVICE_UNIQUE_ID_REGEX.match(unique_id):
+        return False
+
+    # cv.string rejects an explicit null, so a present key has to hold a string
+    if DEVICE_NAME_KEY in data and type(data[DEVICE_NAME_KEY]) is not str:
+        return False
+
+    device = data.get(DEVICE_KEY)
+    if device is None:
+        return DEVICE_KEY not in data
+    if type(device) is not dict or not _DEVICE_SCHEMA_ONLY_KEYS.isdisjoint(device):
+        return False
+
+    for key in _DEVICE_STRING_KEYS:
+        if key in device and type(device[key]) is not str:
+            return False
+
+    for key, pattern in _DEVICE_VERSION_PATTERNS:
+        value = device.get(key)
+        if type(value) is not str or not pattern.match(value):
+            return False
+
+    return True
+
+
+def _is_valid_config(data: Any) -> bool:
+    if type(data) is not dict or not _CONFIG_KEYS.issuperset(data):
+        return False
+
+    controller_entity_id = data.get(CONTROLLER_ENTITY_ID_KEY)
+    if type(controller_entity_id) is not str or not DEVICE_UNIQUE_ID_REGEX.match(
+        controller_entity_id
+    ):
+        return False
+
+    if CONTROLLER_NAME_KEY in data and type(data[CONTROLLER_NAME_KEY]) is not str:
+        return False
+
+    climate_entity_ids = data.get(CLIMATE_ENTITY_ID_KEY)
+    if type(climate_entity_ids) is str:
+        return True
+    return (
+        type(climate_entity_ids) is list
+        and len(climate_entity_ids) > 0
+        and all(type(entity_id) is str for entity_id in climate_entity_ids)
+    )
+
+
 def validate_discovery_info(data: dict[str, Any]) -> dict[str, Invalid]:
+    if _is_valid_discovery_info(data):
+        return {}
+
     errors = {}
     try:
         DISCOVERY_INFO_SCHEMA(data)
@@ -64,12 +172,27 @@ def validate_discovery_info(data: dict[str, Any]) -> dict[str, Invalid]:
             path = ".".join(map(str, error.path))
             errors[path] = f"{path}: {error.msg.capitalize()}"
     except Invalid as ex:
-        path = ".".join(map(str, error.path))
-        errors[path] = f"{path}: {error.msg.capitalize()}"
+        path = ".".join(map(str, ex.path))
+        errors[path] = f"{path}: {ex.msg.capitalize()}"
     return errors
 
 
+def normalize_discovery_info(data: dict[str, Any]) -> dict[str, Any]:
+    """Returns a valid discovery payload with its values coerced by the schema.
+
+    A payload accepted by the fast path holds no value the schema would coerce
+    and is returned as is.
+    """
+    if _is_valid_discovery_info(data):
+        return data
+
+    return DISCOVERY_INFO_SCHEMA(data)
+
+
 def validate_config(data: dict[str, Any]) -> dict[str, Invalid]:
+    if _is_valid_config(data):
+        return {}
+
     errors = {}
     try:
         CONFIG_SCHEMA(data)
@@ -78,6 +201,6 @@ def validate_config(data: dict[str, Any]) -> dict[str, Invalid]:
             path = ".".join(map(str, error.path))
             errors[path] = error.msg.capitalize()
     except Invalid as ex:
-        path = ".".join(map(str, error.path))
-        errors[path] = error.msg.capitalize()
+        path = ".".join(map(str, ex.path))
+        errors[path] = ex.msg.capitalize()
     return errors
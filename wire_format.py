@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import msgpack
+
+from typing import Any
+
+from homeassistant.helpers.json import json_dumps, json_encoder_default
+from homeassistant.util.json import json_loads
+
+from .const import WIRE_FORMAT_JSON, WIRE_FORMAT_MSGPACK
+
+
+class JsonWireFormat:
+    name = WIRE_FORMAT_JSON
+
+    def encode(self, data: Any) -> str:
+        return json_dumps(data)
+
+    def decode(self, payload: str | bytes) -> Any:
+        return json_loads(payload)
+
+
+class MsgpackWireFormat:
+    name = WIRE_FORMAT_MSGPACK
+
+    def encode(self, data: Any) -> bytes:
+        return msgpack.packb(data, default=json_encoder_default, use_bin_type=True)
+
+    def decode(self, payload: str | bytes) -> Any:
+        if isinstance(payload, str):
+            payload = payload.encode()
+        return msgpack.unpackb(payload, raw=False)
+
+
+WIRE_FORMATS = {
+    WIRE_FORMAT_JSON: JsonWireFormat(),
+    WIRE_FORMAT_MSGPACK: MsgpackWireFormat(),
+}
+
+
+def get_wire_format(name: str | None) -> JsonWireFormat | MsgpackWireFormat:
+    return WIRE_FORMATS.get(name or WIRE_FORMAT_JSON, WIRE_FORMATS[WIRE_FORMAT_JSON])